@@ -8,26 +8,41 @@ os.environ["CT2_FORCE_CPU"] = "1"
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from faster_whisper import WhisperModel
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+import ctranslate2
 import numpy as np
 import asyncio
 import json
 import base64
+import struct
 import wave
 import io
+import mmap
+import sqlite3
 import tempfile
 import logging
 import logging.config
 from datetime import datetime
 import uuid
+import hashlib
+import zlib
 import glob
 import threading
+import queue
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from math import gcd
+import multiprocessing
 import torch
 import soundfile as sf
 import librosa
+import av
+from scipy.signal import firwin, resample_poly
 
 # ICU Care Lite imports
 import requests
@@ -42,6 +57,15 @@ import urllib.parse  # Add this
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Utility functions
+CHUNK_AUDIO_EXTENSIONS = (".wav", ".ogg", ".webm")  # Stored chunk formats (compressed chunks may be kept as sent)
+
+def glob_chunk_files(directory):
+    """List stored chunk_* audio files in a directory, whatever their container"""
+    files = []
+    for extension in CHUNK_AUDIO_EXTENSIONS:
+        files.extend(glob.glob(os.path.join(directory, f"chunk_*{extension}")))
+    return files
+
 def sanitize_filename(filename):
     """Sanitize filenames to prevent path traversal and special characters"""
     # Normalize path and get basename
@@ -126,18 +150,29 @@ def _cleanup_session_files(session_id: str, session_audio_dir: str):
     except Exception as cleanup_error:
         logger.error(f"[SESSION {session_id}] Error during cleanup: {str(cleanup_error)}")
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan events"""
     # Startup
+    inference_executor.start()
+    draft_transcriber.start()
+    chunk_writer.start()
+    work_journal.open()
     logger.info("Starting audio processing thread...")
     audio_processor.start()
+    # Pick up work a restart or crash left unfinished
+    audio_processor.replay_journal()
+    resume_background_tasks()
     yield
     # Shutdown
     logger.info("Stopping audio processing thread...")
-    audio_processor.stop()
+    await asyncio.to_thread(audio_processor.stop, PROCESSOR_DRAIN_SECONDS)
+    chunk_writer.stop()
+    work_journal.close()
+    draft_transcriber.shutdown()
+    inference_executor.shutdown()
 
 app = FastAPI(
     title="Whisper Real-time Transcription API",
@@ -159,32 +194,488 @@ app.add_middleware(
 # Mount static files for audio access
 app.mount("/voices", StaticFiles(directory="audio"), name="voices")
 
-# Initialize faster-whisper model
-logger.info("Initializing faster-whisper model")
-try:
-    # Force CPU usage with optimized parameters
-    device = "cpu"
-    compute_type = "int8"  # Use int8 for better CPU performance
-    
-    logger.info(f"Using device: {device}")
-    logger.info("GPU disabled - using CPU only")
-    logger.info("Environment: CUDA_VISIBLE_DEVICES='', CT2_FORCE_CPU=1")
-    
-    # Use smaller model for better CPU performance
-    model = WhisperModel(
-        "small.en",  # Use small model instead of medium for faster processing
-        device=device,
-        compute_type=compute_type,
-        download_root="whisper_models",
-        cpu_threads=max(1, os.cpu_count() - 1),  # Use all but one core
-        num_workers=1   # Single worker for CPU
+# Inference configuration
+WHISPER_MODEL_NAME = "small.en"  # Use small model instead of medium for faster processing
+INFERENCE_MODE = "threads"  # "threads": one shared in-process model, "replicas": one model per pinned process
+INFERENCE_MAX_WORKERS = 6  # Concurrent model.transcribe calls in "threads" mode (CTranslate2 num_workers); the autoscaler decides how many are used
+INFERENCE_REPLICAS = 4  # Model replica processes in "replicas" mode
+INFERENCE_THREADS_PER_REPLICA = 0  # CPU threads per replica, 0 = split available cores evenly
+INFERENCE_TIMEOUT_SECONDS = 300  # Per-call timeout for a single transcription (minimum, see below)
+INFERENCE_TIMEOUT_PER_AUDIO_SECOND = 3.0  # Long audio gets this many seconds per audio second - room for a slow two-pass decode
+STORE_COMPRESSED_AUDIO = True  # Keep Opus/OGG/WebM chunks compressed on disk instead of transcoding to WAV
+
+# Streaming mode (/ws/transcribe with "mode": "stream") and VAD configuration
+STREAM_FRAME_MS = 30  # VAD frame size
+STREAM_MIN_SILENCE_MS = 600  # Pause that ends an utterance
+STREAM_MIN_SPEECH_MS = 250  # Shorter utterances are discarded as noise
+STREAM_MAX_SEGMENT_SECONDS = 25  # Force a final before the 30s Whisper window
+STREAM_PARTIAL_INTERVAL_SECONDS = 1.5  # How often a growing utterance gets a partial hypothesis
+STREAM_PRE_ROLL_MS = 210  # Audio kept from before the detected speech onset
+STREAM_PARTIAL_TIMEOUT_SECONDS = 10  # Partials older than this are useless, give up on them
+VAD_ENERGY_THRESHOLD = 0.01  # Absolute RMS below which a frame is never speech
+VAD_NOISE_RATIO = 3.0  # Speech must be this much louder than the adaptive noise floor
+ENABLE_VAD_PREGATE = True  # Score queued chunks before inference and skip pure silence
+VAD_PREGATE_ENERGY_THRESHOLD = 0.005  # Frame RMS counted as possible speech (about -46 dBFS, deliberately lenient)
+VAD_PREGATE_MIN_SPEECH_MS = 150  # Chunks with less possible speech than this never reach the model
+VAD_STATS_HISTORY = 50  # Per-chunk VAD scores kept per session for /sessions/status
+BATCH_MAX_SIZE = 8  # Max queued chunks decoded together in one batched call (1 disables batching)
+BATCH_MAX_WAIT_MS = 50  # How long to wait for more chunks once the first one is taken
+BATCH_MAX_CHUNK_SECONDS = 30  # Whisper window; longer chunks are transcribed individually
+BATCH_NO_SPEECH_THRESHOLD = 0.6  # Drop batched output that the model scores as non-speech
+AUDIO_POOL_WINDOW_SECONDS = 30  # Pooled decode buffers hold one Whisper window of 16kHz float32
+AUDIO_POOL_MAX_BUFFERS = 16  # Free buffers kept for reuse; longer audio always gets a fresh array
+
+# Decode profiles - faster-whisper transcribe() options, selectable per endpoint, session and upload
+_DECODE_VAD_PARAMETERS = dict(
+    threshold=0.5,
+    min_speech_duration_ms=250,
+    max_speech_duration_s=3600,
+    min_silence_duration_ms=2000
+)
+DECODE_PROFILES = {
+    # Live chunks: greedy, no temperature fallback, no word timing, language pinned
+    "realtime": dict(
+        beam_size=1,
+        best_of=1,
+        temperature=0.0,
+        language="en",
+        condition_on_previous_text=False,
+        vad_filter=True,
+        vad_parameters=_DECODE_VAD_PARAMETERS,
+        word_timestamps=False
+    ),
+    # Greedy with word timing - the cheap first pass of "adaptive"
+    "greedy": dict(
+        beam_size=1,
+        best_of=1,
+        temperature=0.0,
+        language="en",
+        vad_filter=True,
+        vad_parameters=_DECODE_VAD_PARAMETERS,
+        word_timestamps=True
+    ),
+    # The original settings
+    "accurate": dict(
+        beam_size=5,
+        best_of=5,
+        vad_filter=True,
+        vad_parameters=_DECODE_VAD_PARAMETERS,
+        word_timestamps=True
+    ),
+    # Offline reprocessing where latency does not matter
+    "archive": dict(
+        beam_size=10,
+        best_of=10,
+        patience=2.0,
+        vad_filter=True,
+        vad_parameters=_DECODE_VAD_PARAMETERS,
+        word_timestamps=True
     )
-    logger.info("faster-whisper model loaded successfully")
-    logger.info(f"Compute type: {compute_type}")
-    logger.info(f"CPU threads: {max(1, os.cpu_count() - 1)}")
-except Exception as e:
-    logger.error(f"Failed to load whisper model: {str(e)}")
-    raise
+}
+# Profiles the batched decode can honour: it has no word timing, VAD filter or temperature fallback
+# (the pre-gate and no-speech check stand in for the VAD), so only word-timing-free profiles batch
+BATCHABLE_PROFILES = {name for name, options in DECODE_PROFILES.items() if not options.get("word_timestamps")}
+# Two-pass profiles: decode with first_pass, re-decode with second_pass only when the first looks unsure
+TWO_PASS_PROFILES = {
+    "adaptive": {"first_pass": "greedy", "second_pass": "accurate"}
+}
+TWO_PASS_LOGPROB_THRESHOLD = -0.6  # Re-decode if any segment's avg_logprob is below this
+TWO_PASS_COMPRESSION_RATIO_THRESHOLD = 2.4  # ...or its text is this repetitive (gzip ratio, as in Whisper)
+TWO_PASS_NO_SPEECH_THRESHOLD = 0.5  # ...or it produced text while the model thought it was silence
+ENABLE_DRAFT_CASCADE = False  # Push instant drafts from a small model before the final small.en result
+DRAFT_MODEL_NAME = "tiny.en"  # Draft model, loaded only when the cascade is enabled
+DRAFT_CPU_THREADS = 2  # Threads for the draft model, kept small so finals keep most of the CPU
+DRAFT_DECODE_PROFILE = "realtime"
+DRAFT_MAX_PENDING = 2  # Skip drafts when this many are already waiting - a late draft is useless
+DRAFT_FINAL_SLOTS = 2  # Finals the draft model decodes at once at the "draft_model" load level; the rest stay on the main model
+LONG_AUDIO_SPLIT_SECONDS = 120  # Background and streamed uploads longer than this are split and decoded in parallel
+LONG_AUDIO_WINDOW_SECONDS = 60  # Target window length when splitting
+LONG_AUDIO_SEARCH_SECONDS = 15  # Look this far either side of the target for the quietest cut point
+CHUNK_PRIORITIES = ("live", "reprocess", "bulk")  # Scheduler priority classes, highest first
+CHUNK_DEADLINE_SECONDS = {"live": 5, "reprocess": 60, "bulk": 300}  # Overdue chunks jump the priority order
+MAX_QUEUED_LIVE_CHUNKS_PER_SESSION = 20  # Live chunks one session may have in the scheduler; more spill to disk
+REPROCESS_WINDOW_CHUNKS = 12  # Chunks a session reprocess keeps in the scheduler at once, so long sessions never fill the queue
+FLOW_CONTROL_WINDOW = 8  # Credits advertised to /ws/transcribe clients: chunks they may have awaiting transcription
+FLOW_SLOW_DOWN_DEPTH = 8  # Session backlog (queued + spilled) that triggers "slow_down"
+FLOW_RESUME_DEPTH = 2  # Backlog at which a slowed-down session gets "resume"
+SESSION_END_WAIT_SECONDS = 30  # On "end", wait this long for the session's outstanding chunks before "session_complete"
+WORK_JOURNAL_PATH = "work_queue.db"  # SQLite (WAL) journal of queued chunks and background uploads, replayed on startup
+WORK_JOURNAL_REPLAY_MAX_AGE_HOURS = 24  # Unfinished work older than this is not replayed
+WORK_JOURNAL_MAX_ATTEMPTS = 3  # A chunk replayed this many times without finishing is given up on
+UPLOAD_SPOOL_DIR = "uploads"  # Background upload audio is kept here until its task finishes
+PROCESSOR_DRAIN_SECONDS = 30  # On shutdown, keep transcribing queued chunks this long; the rest is replayed next start
+ENABLE_AUTOSCALE = True  # Grow and shrink the processing workers with demand (False runs all of them)
+AUTOSCALE_MIN_WORKERS = 1  # Workers kept running on a quiet ward
+AUTOSCALE_MAX_WORKERS = 6  # Upper bound, capped by the inference pool's concurrency
+AUTOSCALE_INTERVAL_SECONDS = 5  # How often the autoscaler re-evaluates
+AUTOSCALE_QUEUE_DEPTH_PER_WORKER = 3  # Queued chunks per active worker that call for more workers
+AUTOSCALE_UP_WAIT_P95_MS = 2000  # ...or this p95 queue wait since the last evaluation
+AUTOSCALE_MAX_CPU_PERCENT = 85  # Never add a worker while system CPU is this busy - it would only slow the others
+AUTOSCALE_DOWN_IDLE_SECONDS = 60  # Retire a worker once the queue has stayed empty this long
+AUTOSCALE_HISTORY = 20  # Recent scaling decisions kept for /server-status
+ENABLE_LOAD_SHEDDING = True  # Step decoding down as the queue backs up or decodes slow down, back up as load drops
+LOAD_LEVELS = ("normal", "reduced", "minimal", "draft_model")  # Degradation steps, mildest first
+LOAD_QUEUE_WATERMARKS = (6, 16, 40)  # Queued + spilled chunks that step down to reduced / minimal / draft_model
+LOAD_RTF_WATERMARKS = (0.6, 1.0, 1.5)  # ...or the recent real-time factor (decode seconds per audio second)
+LOAD_RECOVERY_RATIO = 0.5  # Step up once both signals are below this fraction of the current level's watermarks
+LOAD_MIN_HOLD_SECONDS = 15  # Time at a level before stepping back up, so quality does not flap
+LOAD_RTF_WINDOW = 20  # Recent decode calls averaged for the real-time factor
+DEGRADED_PROFILES = {
+    # Requested profile -> profile used at that level; profiles not listed are left alone
+    "reduced": {"archive": "accurate", "accurate": "greedy", "adaptive": "greedy"},  # Smaller beams, no second pass
+    "minimal": {"archive": "realtime", "accurate": "realtime", "adaptive": "realtime", "greedy": "realtime"},  # Greedy, no word timing
+    "draft_model": {"archive": "realtime", "accurate": "realtime", "adaptive": "realtime", "greedy": "realtime"}  # ...on the draft model while it has a free slot
+}
+ENABLE_SEGMENT_PARTIALS = True  # Forward decoded segments as "partial" messages while a chunk is still decoding
+DEFAULT_DECODE_PROFILES = {
+    "websocket": "realtime",  # /ws/transcribe chunks, unless the init message asks for another
+    "partial": "realtime",  # Streaming-mode partial hypotheses
+    "upload": "adaptive",  # /transcribe/audio and /transcribe/audio-base64
+    "session": "adaptive"  # /process_session reprocessing
+}
+
+def validate_decode_profile(profile: str):
+    """Return the profile name if it exists, raise ValueError otherwise"""
+    if profile not in DECODE_PROFILES and profile not in TWO_PASS_PROFILES:
+        raise ValueError(f"Unknown decode profile '{profile}'. Available: {', '.join([*DECODE_PROFILES, *TWO_PASS_PROFILES])}")
+    return profile
+
+def load_whisper_model(cpu_threads: int, num_workers: int = 1, model_name: str = None):
+    """Load the faster-whisper model for CPU inference"""
+    model_name = model_name or WHISPER_MODEL_NAME
+    logger.info(f"Initializing faster-whisper model {model_name}")
+    try:
+        # Force CPU usage with optimized parameters
+        device = "cpu"
+        compute_type = "int8"  # Use int8 for better CPU performance
+        
+        logger.info(f"Using device: {device}")
+        logger.info("GPU disabled - using CPU only")
+        logger.info("Environment: CUDA_VISIBLE_DEVICES='', CT2_FORCE_CPU=1")
+        
+        whisper_model = WhisperModel(
+            model_name,
+            device=device,
+            compute_type=compute_type,
+            download_root="whisper_models",
+            cpu_threads=cpu_threads,
+            num_workers=num_workers
+        )
+        logger.info("faster-whisper model loaded successfully")
+        logger.info(f"Compute type: {compute_type}")
+        logger.info(f"CPU threads: {cpu_threads}, workers: {num_workers}")
+        return whisper_model
+    except Exception as e:
+        logger.error(f"Failed to load whisper model: {str(e)}")
+        raise
+
+def available_cpu_cores():
+    """Cores this process is allowed to run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def threads_for_workers(workers: int):
+    """CPU threads per CTranslate2 worker so that `workers` busy workers together fill the cores"""
+    return max(1, len(available_cpu_cores()) // max(1, workers))
+
+def partition_cpu_cores(replicas: int, threads_per_replica: int = 0):
+    """Split the cores available to this process into one disjoint core set per replica"""
+    available = available_cpu_cores()
+    
+    per_replica = threads_per_replica or max(1, len(available) // replicas)
+    if per_replica * replicas > len(available):
+        logger.warning(f"[INFERENCE] {replicas} replicas x {per_replica} threads exceeds {len(available)} available cores, core sets will overlap")
+    
+    core_sets = []
+    for i in range(replicas):
+        cores = [available[(i * per_replica + j) % len(available)] for j in range(per_replica)]
+        core_sets.append(sorted(set(cores)))
+    return core_sets, per_replica
+
+# Set in replica processes: carries streamed segments back to the parent's listener thread
+replica_segment_queue = None
+
+def _init_inference_replica(core_queue, cpu_threads: int, segment_queue=None):
+    """Process pool initializer: pin this replica to its core set and load its own model"""
+    global model, replica_segment_queue
+    replica_segment_queue = segment_queue
+    cores = core_queue.get()
+    try:
+        os.sched_setaffinity(0, cores)
+    except (AttributeError, OSError) as e:
+        logger.warning(f"[INFERENCE] Replica {os.getpid()} could not pin cores {cores}: {str(e)}")
+    model = load_whisper_model(cpu_threads=cpu_threads, num_workers=1)
+    logger.info(f"[INFERENCE] Replica {os.getpid()} ready on cores {cores}")
+
+def _replica_info():
+    """Report the pid and core set of the replica running this call"""
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    return {"pid": os.getpid(), "cores": cores}
+
+def _model_self_test():
+    """Run the loaded model on one second of silence"""
+    test_audio = np.zeros((16000,), dtype=np.float32)  # 1 second of silence
+    segments, info = model.transcribe(test_audio)
+    return True
+
+# Threads are sized for the workers the autoscaler starts with; the executor reloads the model as that count changes.
+# In "replicas" mode each worker process loads its own model instead
+INFERENCE_START_THREADS = threads_for_workers(AUTOSCALE_MIN_WORKERS if ENABLE_AUTOSCALE else INFERENCE_MAX_WORKERS) if INFERENCE_MODE == "threads" else None
+model = load_whisper_model(cpu_threads=INFERENCE_START_THREADS, num_workers=INFERENCE_MAX_WORKERS) if INFERENCE_MODE == "threads" else None
+
+
+class InferenceExecutor:
+    """Bounded worker pool that owns the Whisper model(s) and runs all inference off the event loop
+    
+    In "threads" mode a thread pool shares the in-process model. In "replicas" mode a
+    process pool runs one model per process, each pinned to a disjoint core set.
+    """
+
+    def __init__(self, mode: str = "threads", max_workers: int = 2, replicas: int = 4,
+                 threads_per_replica: int = 0, timeout: float = 300):
+        self.mode = mode
+        self.timeout = timeout
+        self.core_sets = []
+        self.threads_per_replica = None
+        self.replica_info = {}
+        if mode == "replicas":
+            self.core_sets, self.threads_per_replica = partition_cpu_cores(replicas, threads_per_replica)
+            self.max_workers = replicas
+            # Fork so replicas do not re-import this module; the parent holds no model at this point
+            mp_context = multiprocessing.get_context("fork")
+            core_queue = mp_context.Queue()
+            for cores in self.core_sets:
+                core_queue.put(cores)
+            self.segment_queue = mp_context.Queue()
+            self.executor = ProcessPoolExecutor(
+                max_workers=replicas,
+                mp_context=mp_context,
+                initializer=_init_inference_replica,
+                initargs=(core_queue, self.threads_per_replica, self.segment_queue)
+            )
+        else:
+            self.max_workers = max_workers
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+            self.segment_queue = None  # Threads call dispatch_segment directly
+        self.threads_per_worker = INFERENCE_START_THREADS  # Intra-op threads of the shared model ("threads" mode)
+        self.wanted_threads = self.threads_per_worker
+        self.resize_lock = threading.Lock()
+        self.resize_thread = None
+        self.segment_lock = threading.Lock()
+        self.segment_callbacks = {}  # stream_id -> on_segment callback of an in-flight streaming call
+        self.segment_listener = None
+        self.stats_lock = threading.Lock()
+        self.in_flight_calls = 0
+        self.completed_calls = 0
+        self.failed_calls = 0
+        self.timed_out_calls = 0
+        self.two_pass_decodes = 0
+        self.second_pass_decodes = 0
+        self.second_pass_reasons = defaultdict(int)
+
+    @property
+    def concurrency(self):
+        """Number of transcriptions that can run at the same time"""
+        return self.max_workers
+
+    def fit_threads_to_workers(self, workers: int):
+        """Reload the shared model in the background with its threads sized for `workers` busy workers ("threads" mode)"""
+        if self.mode != "threads":
+            return
+        with self.resize_lock:
+            self.wanted_threads = threads_for_workers(workers)
+            if self.resize_thread is not None or self.wanted_threads == self.threads_per_worker:
+                return  # A reload in progress picks up the new size when it finishes
+            self.resize_thread = threading.Thread(target=self._reload_model_loop, daemon=True, name="inference-resize")
+            self.resize_thread.start()
+    
+    def _reload_model_loop(self):
+        """Load models until the loaded thread count matches the wanted one, swapping each in"""
+        global model
+        while True:
+            with self.resize_lock:
+                threads = self.wanted_threads
+                if threads == self.threads_per_worker:
+                    self.resize_thread = None
+                    return
+            try:
+                new_model = load_whisper_model(cpu_threads=threads, num_workers=self.max_workers)
+            except Exception as e:
+                logger.error(f"[INFERENCE] Could not reload model with {threads} threads per worker: {str(e)}")
+                with self.resize_lock:
+                    self.resize_thread = None
+                return
+            # Calls already running finish on the model they started with
+            model = new_model
+            with self.resize_lock:
+                logger.info(f"[INFERENCE] Model threads per worker {self.threads_per_worker} -> {threads}")
+                self.threads_per_worker = threads
+    
+    def start(self):
+        """Spawn and warm up replica processes (no-op in threads mode)"""
+        if self.mode != "replicas":
+            return
+        logger.info(f"[INFERENCE] Starting {self.max_workers} replicas with {self.threads_per_replica} threads each")
+        self.segment_listener = threading.Thread(target=self._segment_listen_loop, daemon=True, name="segment-listener")
+        self.segment_listener.start()
+        futures = [self.submit(_replica_info) for _ in range(self.max_workers)]
+        for future in futures:
+            try:
+                info = future.result(timeout=self.timeout)
+                self.replica_info[info["pid"]] = info
+            except Exception as e:
+                logger.error(f"[INFERENCE] Replica warm-up failed: {str(e)}")
+        logger.info(f"[INFERENCE] Replicas ready: {list(self.replica_info.values())}")
+
+    def timeout_for(self, audio_seconds: float):
+        """Call timeout for this much audio: the flat minimum, scaled up for long recordings"""
+        return max(self.timeout, audio_seconds * INFERENCE_TIMEOUT_PER_AUDIO_SECOND)
+
+    def _on_call_done(self, future):
+        """Update call counters when a submitted call finishes"""
+        with self.stats_lock:
+            self.in_flight_calls -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed_calls += 1
+                return
+            self.completed_calls += 1
+            # Two-pass results carry their trigger outcome - count it whichever process decoded them
+            result = future.result()
+            for item in result if isinstance(result, list) else [result]:
+                if isinstance(item, dict) and "second_pass" in item:
+                    self.two_pass_decodes += 1
+                    if item["second_pass"]:
+                        self.second_pass_decodes += 1
+                        self.second_pass_reasons[item["second_pass_reason"]] += 1
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a module-level callable to the inference pool and return a concurrent future"""
+        with self.stats_lock:
+            self.in_flight_calls += 1
+        future = self.executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._on_call_done)
+        return future
+
+    def run_sync(self, fn, *args, timeout: float = None, **kwargs):
+        """Run a callable in the pool and block the calling (non-event-loop) thread for the result"""
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self.stats_lock:
+                self.timed_out_calls += 1
+            logger.error(f"[INFERENCE] Call timed out after {timeout or self.timeout}s")
+            raise TimeoutError(f"Inference timed out after {timeout or self.timeout}s")
+
+    async def run(self, fn, *args, timeout: float = None, **kwargs):
+        """Run a callable in the pool and await the result without blocking the event loop"""
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout or self.timeout)
+        except asyncio.TimeoutError:
+            with self.stats_lock:
+                self.timed_out_calls += 1
+            logger.error(f"[INFERENCE] Call timed out after {timeout or self.timeout}s")
+            raise TimeoutError(f"Inference timed out after {timeout or self.timeout}s")
+
+    def transcribe_decoded_sync(self, audio, timeout: float = None, profile: str = "accurate"):
+        """Transcribe an already decoded 16kHz float32 array from a worker thread"""
+        return self.run_sync(transcribe_audio, audio, profile, timeout=timeout)
+
+    def transcribe_streaming_sync(self, audio, on_segment, timeout: float = None, profile: str = "accurate"):
+        """
+        Transcribe a decoded array from a worker thread, calling on_segment(segment) as segments decode
+        
+        on_segment(None) means a second decoding pass started over. Segments that arrive
+        after the call returned are dropped, so they can never overtake the final result.
+        """
+        with self._segment_stream(on_segment) as stream_id:
+            return self.run_sync(transcribe_audio_streaming, audio, stream_id, profile, timeout=timeout)
+
+    @contextmanager
+    def _segment_stream(self, on_segment):
+        """Register on_segment under a fresh stream id for the duration of one call"""
+        stream_id = uuid.uuid4().hex
+        with self.segment_lock:
+            self.segment_callbacks[stream_id] = on_segment
+        try:
+            yield stream_id
+        finally:
+            with self.segment_lock:
+                self.segment_callbacks.pop(stream_id, None)
+
+    def dispatch_segment(self, stream_id: str, segment):
+        """Hand a streamed segment to its call's callback, if the call is still in flight"""
+        with self.segment_lock:
+            callback = self.segment_callbacks.get(stream_id)
+            if callback is None:
+                return
+            try:
+                callback(segment)
+            except Exception as e:
+                logger.warning(f"[INFERENCE] Segment callback failed: {str(e)}")
+
+    def _segment_listen_loop(self):
+        """Forward segments streamed by replica processes until shutdown"""
+        while True:
+            item = self.segment_queue.get()
+            if item is None:
+                return
+            self.dispatch_segment(*item)
+
+    def transcribe_batch_sync(self, audios, timeout: float = None, profile: str = "accurate"):
+        """Transcribe several decoded chunks in one batched call from a worker thread"""
+        return self.run_sync(transcribe_audio_batch, audios, profile, timeout=timeout)
+
+    def stats(self):
+        """Get pool layout, load and call counters"""
+        with self.stats_lock:
+            stats = {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "timeout_seconds": self.timeout,
+                "in_flight_calls": self.in_flight_calls,
+                "completed_calls": self.completed_calls,
+                "failed_calls": self.failed_calls,
+                "timed_out_calls": self.timed_out_calls,
+                "two_pass": {
+                    "decodes": self.two_pass_decodes,
+                    "second_passes": self.second_pass_decodes,
+                    "trigger_rate": round(self.second_pass_decodes / self.two_pass_decodes, 3) if self.two_pass_decodes else 0.0,
+                    "reasons": dict(self.second_pass_reasons)
+                }
+            }
+        if self.mode == "threads":
+            stats["threads_per_worker"] = self.threads_per_worker
+        if self.mode == "replicas":
+            stats.update({
+                "replicas": self.max_workers,
+                "threads_per_replica": self.threads_per_replica,
+                "core_sets": self.core_sets,
+                "replica_processes": list(self.replica_info.values())
+            })
+        return stats
+
+    def shutdown(self):
+        """Stop accepting work and wait for in-flight inference to finish"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.segment_listener is not None:
+            self.segment_queue.put(None)
+            self.segment_listener.join(timeout=5)
+        logger.info("Inference executor stopped")
+
+
+inference_executor = InferenceExecutor(
+    mode=INFERENCE_MODE,
+    max_workers=INFERENCE_MAX_WORKERS,
+    replicas=INFERENCE_REPLICAS,
+    threads_per_replica=INFERENCE_THREADS_PER_REPLICA,
+    timeout=INFERENCE_TIMEOUT_SECONDS
+)
 
 
 @app.post("/transcribe/audio")
@@ -192,7 +683,8 @@ async def transcribe_audio_file(
     background_tasks: BackgroundTasks,
     audio_file: UploadFile = File(...),
     language: str = Form("en"),
-    task: str = Form("transcribe")
+    task: str = Form("transcribe"),
+    profile: str = Form(DEFAULT_DECODE_PROFILES["upload"])
 ):
     """
     Transcribe an uploaded audio file
@@ -201,6 +693,7 @@ async def transcribe_audio_file(
         audio_file: Audio file to transcribe (supports: wav, mp3, m4a, flac, etc.)
         language: Language code (default: "en")
         task: Task type - "transcribe" or "translate" (default: "transcribe")
+        profile: Decode profile - "realtime", "greedy", "adaptive", "accurate" or "archive" (default: "adaptive")
     
     Returns:
         JSON with transcription results or task ID for background processing
@@ -208,13 +701,21 @@ async def transcribe_audio_file(
     try:
         logger.info(f"Received audio file: {audio_file.filename} ({audio_file.content_type})")
         
+        try:
+            validate_decode_profile(profile)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
         # Validate file type
         allowed_types = [
             "audio/wav", "audio/mp3", "audio/mpeg", "audio/m4a", 
-            "audio/flac", "audio/ogg", "audio/webm", "audio/aac"
+            "audio/flac", "audio/ogg", "audio/webm", "audio/aac",
+            "audio/opus", "video/webm", "application/ogg"
         ]
         
-        if audio_file.content_type not in allowed_types:
+        # Ignore codec parameters such as "audio/webm;codecs=opus"
+        base_content_type = (audio_file.content_type or "").split(";")[0].strip()
+        if base_content_type not in allowed_types:
             logger.warning(f"Unsupported file type: {audio_file.content_type}")
             raise HTTPException(
                 status_code=400, 
@@ -234,6 +735,11 @@ async def transcribe_audio_file(
             # Generate task ID
             task_id = str(uuid.uuid4())
             
+            # Spool and journal the upload so a restart resumes it instead of losing it
+            spool_path = await asyncio.to_thread(spool_background_upload, task_id, audio_file.filename, audio_bytes)
+            if spool_path:
+                work_journal.task_started(task_id, audio_file.filename, spool_path, language, task, profile)
+            
             # Add to background tasks
             background_tasks.add_task(
                 process_audio_background,
@@ -241,7 +747,9 @@ async def transcribe_audio_file(
                 audio_bytes,
                 audio_file.filename,
                 language,
-                task
+                task,
+                profile,
+                spool_path
             )
             
             logger.info(f"Large file {audio_file.filename} ({file_size_mb:.2f}MB) queued for background processing. Task ID: {task_id}")
@@ -256,7 +764,10 @@ async def transcribe_audio_file(
         else:
             # Process immediately for smaller files
             logger.info(f"Processing {audio_file.filename} immediately (size: {file_size_mb:.2f}MB)")
-            result = transcribe_audio_bytes(audio_bytes)
+            try:
+                result = await audio_processor.transcribe_bytes(audio_bytes, profile, priority="bulk", label=audio_file.filename)
+            except TimeoutError as e:
+                raise HTTPException(status_code=504, detail=str(e))
             
             # Add metadata
             result.update({
@@ -280,6 +791,115 @@ async def transcribe_audio_file(
         logger.error(f"Error transcribing audio file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
+@app.post("/transcribe/audio/stream")
+async def transcribe_audio_stream(
+    audio_file: UploadFile = File(...),
+    language: str = Form("en"),
+    task: str = Form("transcribe"),
+    profile: str = Form(DEFAULT_DECODE_PROFILES["upload"]),
+    format: str = Form("sse")
+):
+    """
+    Transcribe an uploaded audio file, streaming segments as they are decoded
+    
+    Args:
+        audio_file: Audio file to transcribe (any format /transcribe/audio accepts)
+        language: Language code (default: "en")
+        task: Task type - "transcribe" or "translate" (default: "transcribe")
+        profile: Decode profile (default: "adaptive")
+        format: "sse" for Server-Sent Events or "ndjson" for newline-delimited JSON (default: "sse")
+    
+    Returns:
+        A stream of "segment" events with progress (audio seconds decoded vs total),
+        a "restart" event if a second decoding pass starts over, then one "final"
+        event with the full result (or an "error" event)
+    """
+    try:
+        validate_decode_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format not in ("sse", "ndjson"):
+        raise HTTPException(status_code=400, detail="Unsupported format. Allowed: sse, ndjson")
+    
+    logger.info(f"Received audio file for streaming transcription: {audio_file.filename} ({audio_file.content_type})")
+    audio_bytes = await audio_file.read()
+    try:
+        # Decode off the event loop; the inference pool is kept for the model
+        audio = await asyncio.to_thread(decode_audio_bytes, audio_bytes)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode audio: {str(e)}")
+    
+    total_seconds = len(audio) / 16000
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    done_marker = object()
+    
+    def on_segment(segment):
+        loop.call_soon_threadsafe(events.put_nowait, segment)
+    
+    async def run_transcription():
+        try:
+            if total_seconds > LONG_AUDIO_SPLIT_SECONDS:
+                # Same windowed path as background uploads, so no single call has to cover the whole file
+                return await transcribe_long_audio(audio, profile, on_segment=on_segment)
+            return await audio_processor.transcribe_decoded(audio, profile, priority="bulk", label=audio_file.filename, on_segment=on_segment)
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, done_marker)
+    
+    transcription_task = asyncio.create_task(run_transcription())
+    
+    def encode_event(event: dict):
+        if format == "sse":
+            return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        return json.dumps(event, ensure_ascii=False) + "\n"
+    
+    async def event_stream():
+        while True:
+            segment = await events.get()
+            if segment is done_marker:
+                break
+            if segment is None:
+                yield encode_event({"type": "restart"})
+                continue
+            processed_seconds = min(segment["end"], total_seconds)
+            yield encode_event({
+                "type": "segment",
+                **segment,
+                "processed_seconds": processed_seconds,
+                "total_seconds": round(total_seconds, 2),
+                "progress": round(processed_seconds / total_seconds * 100, 1) if total_seconds else 100.0
+            })
+        
+        try:
+            result = transcription_task.result()
+        except Exception as e:
+            logger.error(f"Streaming transcription failed for {audio_file.filename}: {str(e)}")
+            yield encode_event({"type": "error", "message": str(e)})
+            return
+        
+        result.update({
+            "filename": audio_file.filename,
+            "file_size": len(audio_bytes),
+            "content_type": audio_file.content_type,
+            "language": language,
+            "task": task,
+            "timestamp": datetime.now().isoformat()
+        })
+        save_transcription_to_file(audio_file.filename, result)
+        yield encode_event({
+            "type": "final",
+            "text": result.get("text", ""),
+            "language": result.get("language"),
+            "duration": result.get("duration"),
+            "profile": result.get("profile"),
+            "error": result.get("error"),
+            "progress": 100.0
+        })
+        logger.info(f"Streaming transcription completed for {audio_file.filename}")
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(event_stream(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
 @app.get("/task-status/{task_id}")
 async def get_task_status(task_id: str):
     """
@@ -293,7 +913,25 @@ async def get_task_status(task_id: str):
     """
     with task_lock:
         if task_id not in background_tasks:
-            raise HTTPException(status_code=404, detail="Task not found")
+            # Finished before the last restart - the journal still has the outcome
+            journaled = work_journal.get_task(task_id)
+            if journaled is None or journaled["status"] == "processing":
+                raise HTTPException(status_code=404, detail="Task not found")
+            if journaled["status"] == "completed":
+                return {
+                    "task_id": task_id,
+                    "status": "completed",
+                    "result": journaled["result"],
+                    "filename": journaled["filename"],
+                    "completed_at": journaled["finished_at"]
+                }
+            return {
+                "task_id": task_id,
+                "status": "failed",
+                "error": journaled["error"],
+                "filename": journaled["filename"],
+                "failed_at": journaled["finished_at"]
+            }
         
         task_info = background_tasks[task_id]
         
@@ -318,6 +956,7 @@ async def get_task_status(task_id: str):
                 "task_id": task_id,
                 "status": "processing",
                 "progress": task_info.get("progress", 0),
+                "windows": task_info.get("windows"),  # Only for long recordings decoded as parallel windows
                 "filename": task_info["filename"],
                 "started_at": task_info["started_at"]
             }
@@ -393,7 +1032,8 @@ async def transcribe_audio_base64(
     audio_data: str = Form(...),
     filename: str = Form("audio.wav"),
     language: str = Form("en"),
-    task: str = Form("transcribe")
+    task: str = Form("transcribe"),
+    profile: str = Form(DEFAULT_DECODE_PROFILES["upload"])
 ):
     """
     Transcribe audio from base64 encoded data
@@ -403,6 +1043,7 @@ async def transcribe_audio_base64(
         filename: Original filename (for reference)
         language: Language code (default: "en")
         task: Task type - "transcribe" or "translate" (default: "transcribe")
+        profile: Decode profile - "realtime", "greedy", "adaptive", "accurate" or "archive" (default: "adaptive")
     
     Returns:
         JSON with transcription results
@@ -410,6 +1051,11 @@ async def transcribe_audio_base64(
     try:
         logger.info(f"Received base64 audio data for file: {filename}")
         
+        try:
+            validate_decode_profile(profile)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
         # Decode base64 audio data
         try:
             audio_bytes = base64.b64decode(audio_data)
@@ -419,7 +1065,10 @@ async def transcribe_audio_base64(
         logger.info(f"Decoded audio size: {len(audio_bytes)} bytes")
         
         # Transcribe audio
-        result = transcribe_audio_bytes(audio_bytes)
+        try:
+            result = await audio_processor.transcribe_bytes(audio_bytes, profile, priority="bulk", label=filename)
+        except TimeoutError as e:
+            raise HTTPException(status_code=504, detail=str(e))
         
         # Add metadata
         result.update({
@@ -788,13 +1437,12 @@ async def health_check():
         os.remove(test_file)
         
         # Test model with silence
-        test_audio = np.zeros((16000,), dtype=np.float32)  # 1 second of silence
-        segments, info = model.transcribe(test_audio)
+        await inference_executor.run(_model_self_test, timeout=30)
         
         return {
             "status": "healthy",
             "model_loaded": True,
-            "model_name": "small.en (faster-whisper)",
+            "model_name": f"{WHISPER_MODEL_NAME} (faster-whisper)",
             "file_system": "accessible",
             "model_test": "passed",
             "timestamp": datetime.now().isoformat()
@@ -804,7 +1452,7 @@ async def health_check():
         return {
             "status": "unhealthy",
             "model_loaded": True,
-            "model_name": "small.en (faster-whisper)",
+            "model_name": f"{WHISPER_MODEL_NAME} (faster-whisper)",
             "file_system": f"error: {str(e)}",
             "model_test": "failed",
             "timestamp": datetime.now().isoformat()
@@ -836,11 +1484,24 @@ async def server_status():
         
         with audio_processor.queue_lock:
             queue_size = len(audio_processor.processing_queue)
+            scheduler_stats = audio_processor.processing_queue.stats()
+            spilled_now = sum(len(spilled) for spilled in audio_processor.spilled.values())
         
         return {
             "status": "running",
             "active_sessions": active_sessions,
             "queue_size": queue_size,
+            "last_queue_wait_ms": round(audio_processor.last_queue_wait_ms, 1),
+            "max_queue_wait_ms": round(audio_processor.max_queue_wait_ms, 1),
+            "scheduler": scheduler_stats,
+            "spilled_chunks": spilled_now,
+            "spilled_total": audio_processor.spilled_chunks,
+            "inference": inference_executor.stats(),
+            "audio_buffer_pool": audio_buffer_pool.stats(),
+            "work_journal": work_journal.stats(),
+            "load": audio_processor.load_controller.stats(),
+            "autoscaling": audio_processor.autoscaler.stats(audio_processor.active_workers()),
+            "drafts": draft_transcriber.stats(),
             "processed_files": len(audio_processor.processed_files),
             "cpu_usage": cpu_percent,
             "memory_usage": memory.percent if memory else None,
@@ -891,9 +1552,11 @@ async def test_account_endpoints():
 async def get_sessions_status():
     """Get status of all active sessions"""
     try:
+        backlogs = audio_processor.backlog_snapshot()
         with audio_processor.session_lock:
             sessions_info = []
             for session_id, session_info in audio_processor.sessions.items():
+                backlog = backlogs.get(session_id, {"queued": 0, "spilled": 0})
                 sessions_info.append({
                     "session_id": session_id,
                     "username": session_info.get('username', 'unknown'),
@@ -902,7 +1565,18 @@ async def get_sessions_status():
                     "processed_chunks": session_info['processed_chunks'],
                     "complete": session_info['complete'],
                     "websocket_active": session_info['websocket_active'],
-                    "pending_messages": len(session_info.get('pending_messages', [])),
+                    "pending_messages": session_info['outbox'].qsize() if session_info.get('outbox') else 0,
+                    "queued_chunks": backlog["queued"],
+                    "spilled_chunks": backlog["spilled"],
+                    "flow_paused": session_info['flow']['paused'],
+                    "slow_downs": session_info['flow']['slow_downs'],
+                    "vad": {
+                        "scored_chunks": session_info['vad_stats']['scored_chunks'],
+                        "skipped_chunks": session_info['vad_stats']['skipped_chunks'],
+                        "audio_seconds": round(session_info['vad_stats']['audio_seconds'], 2),
+                        "speech_seconds": round(session_info['vad_stats']['speech_seconds'], 2),
+                        "chunks": list(session_info['vad_stats']['chunks'])
+                    },
                     "created_at": session_info['created_at'].strftime("%Y-%m-%d %H:%M:%S"),
                     "progress_percentage": round((session_info['processed_chunks'] / max(session_info['total_chunks'], 1)) * 100, 1)
                 })
@@ -935,14 +1609,11 @@ async def test_websocket():
         }
         
         with audio_processor.session_lock:
-            for session_id, session_info in audio_processor.sessions.items():
-                if session_info['websocket_active']:
-                    try:
-                        websocket = session_info['websocket']
-                        await websocket.send_json(test_message)
-                        logger.info(f"Test message sent to session {session_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to send test message to session {session_id}: {str(e)}")
+            session_ids = list(audio_processor.sessions.keys())
+        
+        for session_id in session_ids:
+            if audio_processor.push_message(session_id, test_message):
+                logger.info(f"Test message sent to session {session_id}")
         
         return {
             "success": True,
@@ -957,19 +1628,184 @@ async def test_websocket():
         }
 
 class AudioBuffer:
-    def __init__(self):
-        self.buffer = []
+    """Fixed-capacity ring buffer of mono 16kHz float32 samples (oldest audio is overwritten when full)"""
+    
+    def __init__(self, capacity_seconds: float = 30):
         self.sample_rate = 16000  # Whisper expects 16kHz audio
         self.channels = 1  # Whisper expects mono audio
+        self.capacity = int(capacity_seconds * self.sample_rate)
+        self.buffer = np.zeros(self.capacity, dtype=np.float32)
+        self.start = 0
+        self.length = 0
 
     def add_audio(self, audio_data):
-        self.buffer.extend(audio_data)
+        audio = np.asarray(audio_data, dtype=np.float32).reshape(-1)
+        if len(audio) >= self.capacity:
+            # Only the newest capacity's worth of samples survives
+            self.buffer[:] = audio[-self.capacity:]
+            self.start = 0
+            self.length = self.capacity
+            return
+        
+        end = (self.start + self.length) % self.capacity
+        first = min(len(audio), self.capacity - end)
+        self.buffer[end:end + first] = audio[:first]
+        self.buffer[:len(audio) - first] = audio[first:]
+        
+        overflow = max(0, self.length + len(audio) - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.length = min(self.capacity, self.length + len(audio))
 
     def get_audio(self):
-        return np.array(self.buffer)
+        end = self.start + self.length
+        if end <= self.capacity:
+            return self.buffer[self.start:end].copy()
+        return np.concatenate((self.buffer[self.start:], self.buffer[:end - self.capacity]))
 
     def clear(self):
-        self.buffer = []
+        self.start = 0
+        self.length = 0
+
+    def duration(self):
+        return self.length / self.sample_rate
+
+    def __len__(self):
+        return self.length
+
+class VoiceActivityDetector:
+    """Frame-energy VAD with an adaptive noise floor - cheap enough to run on every incoming frame"""
+    
+    def __init__(self, frame_ms: int = 30, threshold: float = 0.01, noise_ratio: float = 3.0, sample_rate: int = 16000):
+        self.frame_ms = frame_ms
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.threshold = threshold  # Absolute RMS floor below which a frame is never speech
+        self.noise_ratio = noise_ratio  # Speech must be this many times louder than the background
+        self.noise_floor = threshold / noise_ratio
+
+    def is_speech(self, energy: float):
+        """Classify one frame by its RMS energy, adapting the noise floor on non-speech frames"""
+        speech = energy > max(self.threshold, self.noise_floor * self.noise_ratio)
+        if not speech:
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * energy
+        return speech
+
+class StreamingSegmenter:
+    """
+    Cuts a continuous PCM stream into utterances on VAD-detected pauses
+    
+    push() returns ("partial", audio) events while an utterance grows and a
+    ("final", audio) event once the speaker pauses or the segment hits its max length.
+    """
+    
+    def __init__(self):
+        self.buffer = AudioBuffer(capacity_seconds=STREAM_MAX_SEGMENT_SECONDS + 5)
+        self.vad = VoiceActivityDetector(frame_ms=STREAM_FRAME_MS, threshold=VAD_ENERGY_THRESHOLD, noise_ratio=VAD_NOISE_RATIO)
+        self.pending = np.zeros((0,), dtype=np.float32)  # Samples that don't fill a whole VAD frame yet
+        self.pending_byte = b""  # Odd trailing byte of the last PCM frame - the first half of the next sample
+        self.pre_roll = deque(maxlen=max(1, STREAM_PRE_ROLL_MS // STREAM_FRAME_MS))
+        self.in_speech = False
+        self.speech_ms = 0
+        self.silence_ms = 0
+        self.since_partial_ms = 0
+
+    def push_pcm(self, pcm_bytes: bytes):
+        """Feed raw 16-bit PCM bytes, which may split a sample across frames, and collect the events they trigger"""
+        data = self.pending_byte + pcm_bytes if self.pending_byte else pcm_bytes
+        usable = len(data) - (len(data) % 2)
+        self.pending_byte = bytes(data[usable:])
+        return self.push(pcm16_bytes_to_float32(data[:usable]))
+    
+    def push(self, samples):
+        """Feed float32 samples and collect the partial/final events they trigger"""
+        events = []
+        audio = np.concatenate((self.pending, samples)) if len(self.pending) else samples
+        frame_size = self.vad.frame_size
+        frame_ms = self.vad.frame_ms
+        n_frames = len(audio) // frame_size
+        self.pending = audio[n_frames * frame_size:].copy()
+        
+        for i in range(n_frames):
+            frame = audio[i * frame_size:(i + 1) * frame_size]
+            speech = self.vad.is_speech(float(np.sqrt(np.mean(frame * frame))))
+            
+            if not self.in_speech:
+                if speech:
+                    # Utterance starts - keep a little audio from before the onset
+                    self.in_speech = True
+                    for pre_frame in self.pre_roll:
+                        self.buffer.add_audio(pre_frame)
+                    self.pre_roll.clear()
+                    self.buffer.add_audio(frame)
+                    self.speech_ms = frame_ms
+                    self.silence_ms = 0
+                    self.since_partial_ms = frame_ms
+                else:
+                    self.pre_roll.append(frame.copy())
+                continue
+            
+            self.buffer.add_audio(frame)
+            self.since_partial_ms += frame_ms
+            if speech:
+                self.speech_ms += frame_ms
+                self.silence_ms = 0
+            else:
+                self.silence_ms += frame_ms
+            
+            if self.silence_ms >= STREAM_MIN_SILENCE_MS or self.buffer.duration() >= STREAM_MAX_SEGMENT_SECONDS:
+                events.extend(self._take_segment())
+            elif self.since_partial_ms >= STREAM_PARTIAL_INTERVAL_SECONDS * 1000:
+                self.since_partial_ms = 0
+                events.append(("partial", self.buffer.get_audio()))
+        return events
+
+    def flush(self):
+        """Emit whatever utterance is still open (end of stream)"""
+        if self.in_speech:
+            return self._take_segment()
+        return []
+
+    def _take_segment(self):
+        audio = self.buffer.get_audio()
+        speech_ms = self.speech_ms
+        self.buffer.clear()
+        self.in_speech = False
+        self.speech_ms = 0
+        self.silence_ms = 0
+        self.since_partial_ms = 0
+        if speech_ms < STREAM_MIN_SPEECH_MS:
+            # Too short to be speech (door slam, monitor beep)
+            return []
+        return [("final", audio)]
+
+def pcm16_bytes_to_float32(pcm_bytes):
+    """Convert raw little-endian 16-bit mono PCM into float32 samples in [-1, 1)"""
+    usable = len(pcm_bytes) - (len(pcm_bytes) % 2)
+    return np.frombuffer(pcm_bytes, dtype="<i2", count=usable // 2).astype(np.float32) * (1.0 / 32768.0)
+
+def score_chunk_speech(audio, frame_ms: int = STREAM_FRAME_MS, threshold: float = VAD_PREGATE_ENERGY_THRESHOLD):
+    """
+    Score a decoded chunk for speech with vectorised frame energies
+    
+    Deliberately lenient - it only has to tell pure silence from anything that
+    might be speech; Silero VAD inside the model does the fine-grained work.
+    
+    Returns:
+        Dict with speech_ms, speech_ratio, peak_rms and audio_seconds
+    """
+    frame_size = int(16000 * frame_ms / 1000)
+    n_frames = len(audio) // frame_size
+    if n_frames == 0:
+        return {"speech_ms": 0, "speech_ratio": 0.0, "peak_rms": 0.0, "audio_seconds": round(len(audio) / 16000, 2)}
+    
+    frames = audio[:n_frames * frame_size].reshape(n_frames, frame_size)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    speech_frames = int(np.count_nonzero(rms > threshold))
+    return {
+        "speech_ms": speech_frames * frame_ms,
+        "speech_ratio": round(speech_frames / n_frames, 3),
+        "peak_rms": round(float(rms.max()), 4),
+        "audio_seconds": round(len(audio) / 16000, 2)
+    }
 
 def get_session_audio_files(session_id, username=None):
     """Get all audio files for a specific session, sorted by chunk number"""
@@ -983,7 +1819,7 @@ def get_session_audio_files(session_id, username=None):
         return []
     
     # Get all .wav files in the session directory
-    audio_files = glob.glob(os.path.join(session_dir, "chunk_*.wav"))
+    audio_files = glob_chunk_files(session_dir)
     
     # Sort by chunk number (extract number from filename)
     def extract_chunk_number(filename):
@@ -996,52 +1832,336 @@ def get_session_audio_files(session_id, username=None):
     audio_files.sort(key=extract_chunk_number)
     return audio_files
 
-def transcribe_audio_bytes(audio_bytes, task_id: str = None):
-    """Transcribe audio bytes using faster-whisper"""
+def detect_audio_container(audio_bytes):
+    """Sniff the container format of an audio payload from its magic bytes"""
+    header = bytes(audio_bytes[:12])
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"OggS":
+        return "ogg"  # Opus or Vorbis in OGG
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"  # Matroska/WebM (MediaRecorder output)
+    if header[:4] == b"fLaC":
+        return "flac"
+    return "unknown"
+
+def _resample_av_frame(resampler, frame):
+    """Resample one PyAV frame (None flushes); PyAV >= 9 returns a list of frames"""
+    resampled = resampler.resample(frame)
+    if resampled is None:
+        return []
+    return resampled if isinstance(resampled, list) else [resampled]
+
+class AudioBufferPool:
+    """
+    Recycles fixed-size float32 buffers for decoded audio windows
+    
+    acquire() hands out a view of a pooled buffer; release() takes any array and
+    returns its buffer to the pool if it came from here (other arrays are ignored).
+    Audio longer than one window is allocated normally and counted as oversize.
+    """
+    
+    def __init__(self, window_samples: int, max_buffers: int):
+        self.window_samples = window_samples
+        self.max_buffers = max_buffers
+        self.lock = threading.Lock()
+        self.free_buffers = []
+        self.in_use = {}  # id(buffer) -> buffer, for buffers currently handed out
+        self.hits = 0
+        self.misses = 0
+        self.oversize = 0
+        self.released = 0
+    
+    def acquire(self, n_samples: int):
+        """Get a float32 array of n_samples, backed by a pooled buffer when it fits one window"""
+        if n_samples > self.window_samples:
+            with self.lock:
+                self.oversize += 1
+            return np.empty(n_samples, dtype=np.float32)
+        with self.lock:
+            if self.free_buffers:
+                buffer = self.free_buffers.pop()
+                self.hits += 1
+            else:
+                buffer = None
+                self.misses += 1
+        if buffer is None:
+            buffer = np.empty(self.window_samples, dtype=np.float32)
+        with self.lock:
+            self.in_use[id(buffer)] = buffer
+        return buffer[:n_samples]
+    
+    def release(self, audio):
+        """Return an acquired array's buffer to the pool; the caller must not touch it afterwards"""
+        if audio is None:
+            return
+        buffer = audio.base if audio.base is not None else audio
+        with self.lock:
+            if self.in_use.pop(id(buffer), None) is None:
+                return
+            self.released += 1
+            if len(self.free_buffers) < self.max_buffers:
+                self.free_buffers.append(buffer)
+    
+    def stats(self):
+        """Get hit/miss counters for monitoring"""
+        with self.lock:
+            requests = self.hits + self.misses
+            return {
+                "window_seconds": self.window_samples / 16000,
+                "max_buffers": self.max_buffers,
+                "free_buffers": len(self.free_buffers),
+                "in_use_buffers": len(self.in_use),
+                "hits": self.hits,
+                "misses": self.misses,
+                "oversize": self.oversize,
+                "released": self.released,
+                "hit_rate": round(self.hits / requests, 3) if requests else 0.0
+            }
+
+
+audio_buffer_pool = AudioBufferPool(AUDIO_POOL_WINDOW_SECONDS * 16000, AUDIO_POOL_MAX_BUFFERS)
+
+def decode_compressed_audio(audio_bytes, pool: AudioBufferPool = None):
+    """Stream-decode an Opus/OGG/WebM (or other ffmpeg-readable) payload straight into mono 16kHz float32"""
+    resampler = av.audio.resampler.AudioResampler(format="flt", layout="mono", rate=16000)
+    pieces = []
+    with av.open(io.BytesIO(audio_bytes), mode="r") as container:
+        stream = container.streams.audio[0]
+        for frame in container.decode(stream):
+            for resampled in _resample_av_frame(resampler, frame):
+                pieces.append(resampled.to_ndarray().reshape(-1))
+        # Flush samples buffered inside the resampler
+        for resampled in _resample_av_frame(resampler, None):
+            pieces.append(resampled.to_ndarray().reshape(-1))
+    
+    if not pieces:
+        return np.zeros((0,), dtype=np.float32)
+    if pool is None:
+        return np.concatenate(pieces).astype(np.float32, copy=False)
+    return np.concatenate(pieces, out=pool.acquire(sum(len(piece) for piece in pieces)))
+
+def encode_wav_pcm16(audio, samplerate: int = 16000):
+    """Encode a float32 audio array as 16-bit PCM WAV bytes"""
+    wav_buffer = io.BytesIO()
+    sf.write(wav_buffer, audio, samplerate, subtype="PCM_16", format="WAV")
+    return wav_buffer.getvalue()
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def parse_wav_header(buffer):
+    """
+    Walk the RIFF chunks of a WAV payload (bytes, memoryview or mmap) without copying it
+    
+    Returns:
+        Dict with format, channels, sample_rate, bits_per_sample, data_offset and
+        data_length, or None if the payload is not a WAV file we can read directly
+    """
+    if len(buffer) < 12 or bytes(buffer[:4]) != b"RIFF" or bytes(buffer[8:12]) != b"WAVE":
+        return None
+    
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(buffer):
+        chunk_id = bytes(buffer[offset:offset + 4])
+        (chunk_size,) = struct.unpack_from("<I", buffer, offset + 4)
+        body = offset + 8
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            format_tag, channels, sample_rate, _, _, bits_per_sample = struct.unpack_from("<HHIIHH", buffer, body)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # The real format tag is the first two bytes of the SubFormat GUID
+                (format_tag,) = struct.unpack_from("<H", buffer, body + 24)
+            fmt = {
+                "format": format_tag,
+                "channels": channels,
+                "sample_rate": sample_rate,
+                "bits_per_sample": bits_per_sample
+            }
+        elif chunk_id == b"data" and fmt is not None:
+            # Streaming writers leave the size at 0 or 0xFFFFFFFF - take whatever is there
+            available = len(buffer) - body
+            data_length = chunk_size if 0 < chunk_size <= available else available
+            return {**fmt, "data_offset": body, "data_length": data_length}
+        offset = body + chunk_size + (chunk_size & 1)  # Chunks are word aligned
+    return None
+
+@lru_cache(maxsize=16)
+def _resample_filter(up: int, down: int):
+    """Anti-aliasing FIR for a polyphase up/down ratio, designed once per ratio"""
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    return firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(np.float32)
+
+def resample_to_16k(audio, samplerate: int, pool: AudioBufferPool = None):
+    """Polyphase-resample a float32 array to 16kHz, returning it untouched if it already is"""
+    if samplerate == 16000:
+        return audio
+    divisor = gcd(int(samplerate), 16000)
+    up, down = 16000 // divisor, int(samplerate) // divisor
+    resampled = resample_poly(audio, up, down, window=_resample_filter(up, down))
+    if pool is None:
+        return resampled.astype(np.float32, copy=False)
+    # The native-rate input is no longer needed once resampled
+    pool.release(audio)
+    output = pool.acquire(len(resampled))
+    output[:] = resampled
+    return output
+
+def decode_pcm_wav(buffer, header: dict, pool: AudioBufferPool = None):
+    """
+    Decode PCM16/float32 WAV sample data straight from the buffer into mono float32
+    
+    With a pool the output lands in a recycled buffer instead of a fresh array.
+    
+    Returns:
+        (audio, samplerate), or None for sample formats that need soundfile
+    """
+    channels = header["channels"]
+    bits = header["bits_per_sample"]
+    if header["format"] == WAVE_FORMAT_PCM and bits == 16:
+        dtype, scale = np.dtype("<i2"), 1.0 / 32768.0
+    elif header["format"] == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        dtype, scale = np.dtype("<f4"), None
+    else:
+        return None
+    
+    frame_bytes = dtype.itemsize * channels
+    n_frames = header["data_length"] // frame_bytes
+    # A view over the payload - the only allocation is the float32 output below
+    samples = np.frombuffer(buffer, dtype=dtype, count=n_frames * channels, offset=header["data_offset"])
+    audio = pool.acquire(n_frames) if pool is not None else np.empty(n_frames, dtype=np.float32)
+    if channels > 1:
+        np.mean(samples.reshape(n_frames, channels), axis=1, dtype=np.float32, out=audio)
+    else:
+        audio[:] = samples
+    if scale is not None:
+        audio *= scale
+    return audio, header["sample_rate"]
+
+def read_chunk_audio(filepath: str, pool: AudioBufferPool = None):
+    """
+    Read a stored chunk file into the mono 16kHz float32 array Whisper expects
+    
+    PCM WAV files are memory-mapped and converted straight from the mapped pages,
+    so the only full-size allocation is the float32 result. Other formats are read
+    into memory and go through decode_audio_bytes.
+    """
+    with open(filepath, "rb") as f:
+        if filepath.lower().endswith(".wav") and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                header = parse_wav_header(mapped)
+                decoded = decode_pcm_wav(mapped, header, pool) if header is not None else None
+            if decoded is not None:
+                audio, samplerate = decoded
+                return resample_to_16k(audio, samplerate, pool)
+            f.seek(0)
+        audio_bytes = f.read()
+    return decode_audio_bytes(audio_bytes, pool)
+
+def read_wav_duration(filepath: str):
+    """Get a WAV file's duration in seconds from its header, or None if it has no readable one"""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            header = parse_wav_header(mapped)
+    if header is None or not header["channels"] or not header["bits_per_sample"] or not header["sample_rate"]:
+        return None
+    frame_bytes = header["channels"] * header["bits_per_sample"] // 8
+    return header["data_length"] // frame_bytes / header["sample_rate"]
+
+def decode_audio_bytes(audio_bytes, pool: AudioBufferPool = None):
+    """
+    Decode audio bytes into the mono 16kHz float32 array Whisper expects
+    
+    With a pool the result may live in a recycled buffer; the caller then owns it
+    until it hands it back with pool.release().
+    """
+    container = detect_audio_container(audio_bytes)
+    if container not in ("wav", "flac"):
+        # Compressed formats (Opus/OGG/WebM, mp3, m4a...) go through the streaming decoder
+        return decode_compressed_audio(audio_bytes, pool)
+    
+    decoded = None
+    if container == "wav":
+        # Fast path: our clients record PCM16 WAV, which needs no decoder at all
+        header = parse_wav_header(audio_bytes)
+        if header is not None:
+            decoded = decode_pcm_wav(audio_bytes, header, pool)
+    
+    if decoded is None:
+        # FLAC and unusual WAV sample formats (8/24-bit, A-law...) go through soundfile
+        audio, samplerate = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=True)
+        decoded = (audio.mean(axis=1, dtype=np.float32), samplerate)
+    
+    # Whisper expects a numpy float32 array with shape (n_samples,) at 16kHz
+    audio, samplerate = decoded
+    return resample_to_16k(audio, samplerate, pool)
+
+def _segment_value(segment, name: str, default=None):
+    """Read a field from a faster-whisper Segment or a batched dict segment"""
+    if isinstance(segment, dict):
+        return segment.get(name, default)
+    return getattr(segment, name, default)
+
+def second_pass_reason(result: dict):
+    """Return why a first-pass result needs re-decoding ("avg_logprob", "compression_ratio", "no_speech_prob"), or None"""
+    if result.get("error"):
+        return None
+    for segment in result.get("segments") or []:
+        avg_logprob = _segment_value(segment, "avg_logprob")
+        if avg_logprob is not None and avg_logprob < TWO_PASS_LOGPROB_THRESHOLD:
+            return "avg_logprob"
+        compression_ratio = _segment_value(segment, "compression_ratio")
+        if compression_ratio is not None and compression_ratio > TWO_PASS_COMPRESSION_RATIO_THRESHOLD:
+            return "compression_ratio"
+        no_speech_prob = _segment_value(segment, "no_speech_prob")
+        if no_speech_prob is not None and no_speech_prob > TWO_PASS_NO_SPEECH_THRESHOLD and _segment_value(segment, "text", "").strip():
+            return "no_speech_prob"
+    return None
+
+def _merge_two_pass_result(profile: str, first: dict, second: dict = None, reason: str = None):
+    """Pick the final result of a two-pass decode and tag it for the executor's trigger counters"""
+    result = second if second is not None and not second.get("error") else first
+    result.update({
+        "profile": profile,
+        "first_pass_profile": TWO_PASS_PROFILES[profile]["first_pass"],
+        "second_pass": reason is not None,
+        "second_pass_reason": reason
+    })
+    return result
+
+def transcribe_audio(audio, profile: str = "accurate", on_segment=None):
+    """
+    Transcribe a decoded 16kHz float32 audio array using faster-whisper with a named decode profile
+    
+    on_segment(segment) is called for each segment as soon as it is decoded;
+    on_segment(None) signals that a second pass is starting over.
+    """
+    if profile in TWO_PASS_PROFILES:
+        passes = TWO_PASS_PROFILES[profile]
+        first = transcribe_audio(audio, passes["first_pass"], on_segment)
+        reason = second_pass_reason(first)
+        if reason is None:
+            return _merge_two_pass_result(profile, first)
+        logger.info(f"First pass unsure ({reason}), re-decoding with {passes['second_pass']}")
+        if on_segment is not None:
+            on_segment(None)
+        return _merge_two_pass_result(profile, first, transcribe_audio(audio, passes["second_pass"], on_segment), reason)
+    
     try:
-        # Convert bytes to numpy array audio
-        audio_buffer = io.BytesIO(audio_bytes)
-        
-        # Load audio with soundfile (supports file-like object)
-        audio, samplerate = sf.read(audio_buffer)
-        
-        # Convert audio to mono and 16kHz if needed (Whisper expects 16000 Hz)
-        audio = librosa.to_mono(audio.T) if audio.ndim > 1 else audio
-        audio = librosa.resample(audio, orig_sr=samplerate, target_sr=16000)
-        
-        # Whisper expects a numpy float32 array with shape (n_samples,)
-        audio = audio.astype(np.float32)
-        
-        # Update progress if this is a background task
-        if task_id:
-            with task_lock:
-                if task_id in background_tasks:
-                    background_tasks[task_id]["progress"] = 10
-        
         # Run transcription with faster-whisper
-        logger.info(f"Transcription started at {datetime.now().strftime('%H:%M:%S')}")
-        segments, info = model.transcribe(
-            audio,
-            beam_size=5,
-            best_of=5,
-            vad_filter=True,
-            vad_parameters=dict(
-                threshold=0.5,
-                min_speech_duration_ms=250,
-                max_speech_duration_s=3600,
-                min_silence_duration_ms=2000
-            ),
-            word_timestamps=True  # Enable word-level timing
-        )
-        
-        # Update progress if this is a background task
-        if task_id:
-            with task_lock:
-                if task_id in background_tasks:
-                    background_tasks[task_id]["progress"] = 90
+        logger.info(f"Transcription started at {datetime.now().strftime('%H:%M:%S')} (profile: {profile})")
+        segments, info = model.transcribe(audio, **DECODE_PROFILES[profile])
         
-        # Convert segments generator to list for multiple iterations
-        segments_list = list(segments)
+        # Drain the segments generator, forwarding each segment as soon as it is decoded
+        segments_list = []
+        for segment in segments:
+            segments_list.append(segment)
+            if on_segment is not None:
+                on_segment(segment)
         
         # Combine all segments into a single text
         transcription_text = " ".join([segment.text for segment in segments_list]).strip()
@@ -1054,6 +2174,8 @@ def transcribe_audio_bytes(audio_bytes, task_id: str = None):
             "language": info.language,
             "language_probability": info.language_probability,
             "confidence": info.language_probability,  # Using language probability as confidence
+            "duration": len(audio) / 16000,
+            "profile": profile,
             "segments": segments_list  # Include segments for word-level timing
         }
     except Exception as e:
@@ -1065,6 +2187,212 @@ def transcribe_audio_bytes(audio_bytes, task_id: str = None):
             "error": str(e)
         }
 
+def transcribe_audio_streaming(audio, stream_id: str, profile: str = "accurate"):
+    """Transcribe a decoded array, streaming each segment back to the parent's InferenceExecutor"""
+    def on_segment(segment):
+        item = None if segment is None else {
+            "start": round(segment.start, 2),
+            "end": round(segment.end, 2),
+            "text": segment.text.strip()
+        }
+        if replica_segment_queue is not None:
+            replica_segment_queue.put((stream_id, item))
+        else:
+            inference_executor.dispatch_segment(stream_id, item)
+    
+    return transcribe_audio(audio, profile, on_segment)
+
+def get_compression_ratio(text: str):
+    """gzip compression ratio of a transcript - high values mean repetitive (hallucinated) output"""
+    text_bytes = text.encode("utf-8")
+    return len(text_bytes) / len(zlib.compress(text_bytes)) if text_bytes else 0.0
+
+def _generate_batch(audios, profile: str = "accurate"):
+    """Run one batched encoder/decoder pass over several <=30s audio arrays"""
+    options = DECODE_PROFILES[profile]
+    tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language="en")
+    features = np.stack([pad_or_trim(model.feature_extractor(audio)) for audio in audios])
+    encoder_output = model.model.encode(ctranslate2.StorageView.from_array(np.ascontiguousarray(features)), to_cpu=False)
+    prompt = model.get_prompt(tokenizer, [], without_timestamps=True)
+    outputs = model.model.generate(
+        encoder_output,
+        [prompt] * len(audios),
+        beam_size=options["beam_size"],
+        patience=options.get("patience", 1),
+        length_penalty=1,
+        max_length=448,
+        return_scores=True,
+        return_no_speech_prob=True,
+        suppress_blank=True,
+        suppress_tokens=[-1]
+    )
+    
+    results = []
+    for audio, output in zip(audios, outputs):
+        tokens = output.sequences_ids[0]
+        avg_logprob = output.scores[0]
+        text = tokenizer.decode(tokens).strip()
+        # Same silence rule Whisper uses: high no-speech probability and low-confidence tokens
+        if output.no_speech_prob > BATCH_NO_SPEECH_THRESHOLD and avg_logprob < -1.0:
+            text = ""
+        duration = len(audio) / 16000
+        results.append({
+            "text": text,
+            "language": "en",
+            "language_probability": 1.0,
+            "confidence": 1.0,  # English-only model, same as faster-whisper's language probability
+            "duration": duration,
+            "segments": [{
+                "start": 0.0,
+                "end": duration,
+                "text": text,
+                "words": [],
+                "avg_logprob": avg_logprob,
+                "no_speech_prob": output.no_speech_prob,
+                "compression_ratio": get_compression_ratio(text)
+            }] if text else [],
+            "profile": profile,
+            "batched": True,
+            "batch_size": len(audios)
+        })
+    return results
+
+def transcribe_audio_batch(audios, profile: str = "accurate"):
+    """Transcribe several decoded chunks with one batched model call, one result per input"""
+    if profile not in BATCHABLE_PROFILES:
+        # The batched pass would drop this profile's VAD filter, word timing and fallback
+        return [transcribe_audio(audio, profile=profile) for audio in audios]
+    
+    results = [None] * len(audios)
+    batch_indices = []
+    batch_audio = []
+    for i, audio in enumerate(audios):
+        if len(audio) > BATCH_MAX_CHUNK_SECONDS * 16000:
+            # Longer than one Whisper window - needs the regular sliding-window decode
+            results[i] = transcribe_audio(audio, profile=profile)
+        else:
+            batch_indices.append(i)
+            batch_audio.append(audio)
+    
+    if batch_audio:
+        logger.info(f"Batched transcription started for {len(batch_audio)} chunks at {datetime.now().strftime('%H:%M:%S')}")
+        try:
+            for i, result in zip(batch_indices, _generate_batch(batch_audio, profile)):
+                results[i] = result
+        except Exception as e:
+            logger.error(f"Batched transcription failed, falling back to per-chunk decode: {str(e)}")
+            for i, audio in zip(batch_indices, batch_audio):
+                results[i] = transcribe_audio(audio, profile=profile)
+        logger.info(f"Batched transcription completed at {datetime.now().strftime('%H:%M:%S')}")
+    return results
+
+def split_audio_at_silences(audio, window_seconds: float = LONG_AUDIO_WINDOW_SECONDS,
+                            search_seconds: float = LONG_AUDIO_SEARCH_SECONDS, frame_ms: int = STREAM_FRAME_MS):
+    """
+    Split long audio into windows of about window_seconds, cutting at the quietest point near each target
+    
+    Returns:
+        List of (start_sample, end_sample) covering the whole array
+    """
+    frame_size = int(16000 * frame_ms / 1000)
+    n_frames = len(audio) // frame_size
+    window_frames = int(window_seconds * 1000 / frame_ms)
+    if n_frames <= window_frames + int(search_seconds * 1000 / frame_ms):
+        return [(0, len(audio))]
+    
+    # Frame energies, smoothed over ~300ms so a cut lands in a pause rather than between two syllables
+    rms = np.sqrt(np.mean(np.square(audio[:n_frames * frame_size].reshape(n_frames, frame_size)), axis=1))
+    smoothing = max(1, 300 // frame_ms)
+    energy = np.convolve(rms, np.ones(smoothing, dtype=np.float32) / smoothing, mode="same")
+    
+    search_frames = int(search_seconds * 1000 / frame_ms)
+    cuts = [0]
+    while n_frames - cuts[-1] > window_frames + search_frames:
+        target = cuts[-1] + window_frames
+        low, high = target - search_frames, min(target + search_frames, n_frames - 1)
+        cuts.append(low + int(np.argmin(energy[low:high])))
+    
+    bounds = [cut * frame_size for cut in cuts] + [len(audio)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _offset_segment(segment, offset: float):
+    """Serialize a window's segment (Segment object or dict) with timestamps shifted into the full recording"""
+    words = _segment_value(segment, "words") or []
+    return {
+        "start": round(_segment_value(segment, "start") + offset, 2),
+        "end": round(_segment_value(segment, "end") + offset, 2),
+        "text": _segment_value(segment, "text", ""),
+        "words": [{
+            "word": _segment_value(word, "word"),
+            "start": round(_segment_value(word, "start") + offset, 2),
+            "end": round(_segment_value(word, "end") + offset, 2),
+            "probability": _segment_value(word, "probability", 0.99)
+        } for word in words],
+        "avg_logprob": _segment_value(segment, "avg_logprob"),
+        "no_speech_prob": _segment_value(segment, "no_speech_prob"),
+        "compression_ratio": _segment_value(segment, "compression_ratio")
+    }
+
+async def transcribe_long_audio(audio, profile: str = "accurate", on_window_done=None, on_segment=None):
+    """
+    Transcribe long audio by splitting it at silences and decoding the windows in parallel
+    
+    on_window_done(windows_done, windows_total, seconds_done) is called as each window finishes.
+    on_segment(segment) gets every segment in recording order, released as soon as all earlier
+    windows have finished. Segment and word timestamps are shifted back onto the full recording's timeline.
+    """
+    windows = split_audio_at_silences(audio)
+    total_seconds = len(audio) / 16000
+    logger.info(f"Long audio ({total_seconds:.0f}s) split into {len(windows)} windows")
+    
+    # Windows go through the scheduler as bulk jobs sharing one round-robin slot, so live chunks
+    # overtake them; only a few are queued at a time to keep the scheduler shallow
+    slots = asyncio.Semaphore(audio_processor.autoscaler.max_workers)
+    progress = {"windows": 0, "seconds": 0.0, "next_emit": 0}
+    finished = {}
+    queue_id = f"bulk_{uuid.uuid4().hex}"
+    
+    async def run_window(index, start, end):
+        async with slots:
+            result = await audio_processor.transcribe_decoded(audio[start:end], profile, priority="bulk",
+                                                              label=f"window@{start / 16000:.0f}s", queue_id=queue_id)
+        progress["windows"] += 1
+        progress["seconds"] += (end - start) / 16000
+        if on_window_done is not None:
+            on_window_done(progress["windows"], len(windows), progress["seconds"])
+        if on_segment is not None:
+            # Windows finish out of order; hold a window back until everything before it is out
+            finished[index] = result
+            while progress["next_emit"] in finished:
+                window_result = finished.pop(progress["next_emit"])
+                window_offset = windows[progress["next_emit"]][0] / 16000
+                for segment in window_result.get("segments") or []:
+                    on_segment(_offset_segment(segment, window_offset))
+                progress["next_emit"] += 1
+        return result
+    
+    results = await asyncio.gather(*(run_window(index, start, end) for index, (start, end) in enumerate(windows)))
+    
+    segments = []
+    for (start, _), result in zip(windows, results):
+        if result.get("error"):
+            logger.error(f"Window at {start / 16000:.1f}s failed: {result['error']}")
+        segments.extend(_offset_segment(segment, start / 16000) for segment in result.get("segments") or [])
+    
+    language_probabilities = [result.get("language_probability", 0.0) for result in results if not result.get("error")]
+    language_probability = sum(language_probabilities) / len(language_probabilities) if language_probabilities else 0.0
+    return {
+        "text": " ".join(segment["text"].strip() for segment in segments).strip(),
+        "language": next((result["language"] for result in results if result.get("language")), "en"),
+        "language_probability": language_probability,
+        "confidence": language_probability,
+        "duration": total_seconds,
+        "profile": profile,
+        "windows": len(windows),
+        "failed_windows": sum(1 for result in results if result.get("error")),
+        "segments": segments
+    }
+
 def save_transcription_to_file(original_filename: str, result: dict):
     """
     Save transcription result to a text file in the transcriptions directory
@@ -1203,9 +2531,14 @@ async def get_latest_transcription_json(form_type_id: str, nhino: str):
 
 
 @app.get("/process_session/{session_id}")
-async def process_session_audio(session_id: str, username: str = None):
+async def process_session_audio(session_id: str, username: str = None, profile: str = DEFAULT_DECODE_PROFILES["session"]):
     """Process all audio files in a session and return transcriptions"""
-    logger.info(f"Starting processing for session: {session_id} (username: {username})")
+    logger.info(f"Starting processing for session: {session_id} (username: {username}, profile: {profile})")
+    
+    try:
+        validate_decode_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     audio_files = get_session_audio_files(session_id, username)
     if not audio_files:
@@ -1217,16 +2550,26 @@ async def process_session_audio(session_id: str, username: str = None):
     transcriptions = []
     total_files = len(audio_files)
     
-    for i, audio_file in enumerate(audio_files, 1):
+    # Chunks go in at "reprocess" priority, a bounded window at a time: live websocket chunks still go
+    # first, and a long session can neither overflow the queue nor crowd live chunks into spilling
+    pending_files = deque(audio_files)
+    submitted = deque()
+    
+    def submit_next():
+        audio_file = pending_files.popleft()
+        chunk_number = int(os.path.basename(audio_file).split('_')[1])
+        job = ChunkJob(f"reprocess_{session_id}", chunk_number, audio_file, profile=profile, priority="reprocess")
+        submitted.append((chunk_number, audio_file, audio_processor.submit(job)))
+    
+    while pending_files or submitted:
+        while pending_files and len(submitted) < REPROCESS_WINDOW_CHUNKS:
+            submit_next()
+        chunk_number, audio_file, future = submitted.popleft()
         try:
-            chunk_number = int(os.path.basename(audio_file).split('_')[1])
-            logger.info(f"[SESSION {session_id}] Processing chunkHHHHHHHHHHHHHHHHHH {chunk_number}/{total_files} - File: {audio_file}")
+            logger.info(f"[SESSION {session_id}] Processing chunk {chunk_number}/{total_files} - File: {audio_file}")
             
-            with open(audio_file, "rb") as f:
-                audio_bytes = f.read()
-
-            # Process with Whisper model
-            result = transcribe_audio_bytes(audio_bytes)
+            # Process with Whisper model through the fair scheduler
+            result = await asyncio.wrap_future(future)
             transcription_text = result["text"].strip()
             
             transcription_data = {
@@ -1287,7 +2630,7 @@ async def list_sessions():
                     session_path = os.path.join(username_path, session_dir)
                     
                     # Count audio files
-                    audio_files = glob.glob(os.path.join(session_path, "chunk_*.wav"))
+                    audio_files = glob_chunk_files(session_path)
                     
                     # Get creation time
                     creation_time = datetime.fromtimestamp(os.path.getctime(session_path))
@@ -1305,7 +2648,7 @@ async def list_sessions():
             session_path = os.path.join(audio_dir, username_dir)
             
             # Count audio files
-            audio_files = glob.glob(os.path.join(session_path, "chunk_*.wav"))
+            audio_files = glob_chunk_files(session_path)
             
             # Get creation time
             creation_time = datetime.fromtimestamp(os.path.getctime(session_path))
@@ -1339,7 +2682,7 @@ async def list_sessions_by_username(username: str):
             session_path = os.path.join(username_path, session_dir)
             
             # Count audio files
-            audio_files = glob.glob(os.path.join(session_path, "chunk_*.wav"))
+            audio_files = glob_chunk_files(session_path)
             
             # Get creation time
             creation_time = datetime.fromtimestamp(os.path.getctime(session_path))
@@ -1646,6 +2989,12 @@ async def websocket_endpoint(websocket: WebSocket):
     total_messages = 0
     websocket_connection = websocket  # Store reference to websocket
     username = "unknown"  # Default username - will be updated when "init" message is received
+    binary_audio = False  # Binary audio frames, negotiated in the "init" message
+    segmenter = None  # Server-side VAD segmenter, only in "stream" mode
+    stream_icu_data = {}  # Latest ICU context seen on the stream
+    partial_task = None
+    decode_profile = DEFAULT_DECODE_PROFILES["websocket"]  # Can be overridden by the "init" message
+    drafts = ENABLE_DRAFT_CASCADE  # Draft-then-final cascade, can be turned off per session
     
     logger.info(f"=== NEW SESSION STARTED: {session_id} ===")
     
@@ -1654,46 +3003,94 @@ async def websocket_endpoint(websocket: WebSocket):
     os.makedirs(session_audio_dir, exist_ok=True)
     logger.info(f"[SESSION {session_id}] Temporary audio directory created: {session_audio_dir}")
     
+    # Every outgoing message goes through the session outbox so the processor thread
+    # can push results the moment they are ready and ordering with acks is preserved
+    outbox = asyncio.Queue()
+    sender_task = asyncio.create_task(websocket_sender(session_id, websocket_connection, outbox))
+    
     # Register this session with the audio processor
     # Note: username will be "unknown" initially, will be updated when "init" message is received
-    audio_processor.register_session(session_id, session_audio_dir, websocket_connection, username)
+    audio_processor.register_session(session_id, session_audio_dir, websocket_connection, username,
+                                     loop=asyncio.get_running_loop(), outbox=outbox)
     logger.info(f"[SESSION {session_id}] Session registered with initial username: {username}")
     
+    def enqueue_chunk(chunk_number: int, audio_bytes: bytes, icu_data: dict):
+        """Queue a chunk for transcription and hand its durable copy to the background writer"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
+        
+        # Compressed payloads (Opus/OGG/WebM) are decoded server-side; keep them compressed on disk if configured
+        container = detect_audio_container(audio_bytes)
+        store_as_wav = container not in ("ogg", "webm") or not STORE_COMPRESSED_AUDIO
+        chunk_extension = ".wav" if store_as_wav else f".{container}"
+        
+        # Save audio chunk to file immediately with safe path handling
+        chunk_filename = f"chunk_{chunk_number}_{timestamp}{chunk_extension}"
+        try:
+            chunk_filepath = safe_path_join(session_audio_dir, chunk_filename)
+        except ValueError as e:
+            logger.error(f"[SESSION {session_id}] Invalid filename: {str(e)}")
+            outbox.put_nowait({
+                "type": "error",
+                "message": f"Invalid filename for chunk {chunk_number}",
+                "chunk": chunk_number
+            })
+            return
+        
+        # Hand the decoded bytes straight to the processor (background processing) with ICU data
+        audio_processor.add_chunk_to_queue(session_id, chunk_filepath, chunk_number, icu_data, audio_bytes=audio_bytes, profile=decode_profile, draft=drafts)
+        
+        # Persist the durable copy in the background; the client is acked once it is on disk
+        chunk_writer.write(
+            chunk_filepath,
+            audio_bytes,
+            on_done=make_chunk_saved_callback(session_id, chunk_number, chunk_filename, chunk_filepath),
+            transcode_to_wav=container in ("ogg", "webm") and store_as_wav
+        )
+    
     try:
         while True:
-            # Check for pending transcription messages first
-            pending_messages = []
-            with audio_processor.session_lock:
-                if session_id in audio_processor.sessions:
-                    session_info = audio_processor.sessions[session_id]
-                    if 'pending_messages' in session_info and session_info['pending_messages']:
-                        pending_messages = session_info['pending_messages'].copy()
-                        session_info['pending_messages'] = []
-            
-            # Send pending messages outside the lock
-            for msg in pending_messages:
-                try:
-                    await websocket.send_json(msg)
-                    logger.info(f"[SESSION {session_id}] Sent pending message: {msg['text']}")
-                except Exception as e:
-                    logger.error(f"[SESSION {session_id}] Failed to send pending message: {str(e)}")
-            
-            # Receive new data with timeout
-            try:
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=1.0)  # Increased timeout
-            except asyncio.TimeoutError:
-                # No new data, continue to check for pending messages
-                continue
+            # Transcriptions are pushed by the sender task, so just wait for the next message
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
                 
             total_messages += 1
-            message = json.loads(data)
+            if frame.get("bytes") is not None:
+                # Binary audio frame: length-prefixed JSON header followed by raw audio bytes
+                if not binary_audio:
+                    logger.warning(f"[SESSION {session_id}] Binary frame received but binary audio was not negotiated")
+                    await outbox.put({
+                        "type": "error",
+                        "message": "Binary audio frames require \"binary_audio\": true in the init message"
+                    })
+                    continue
+                try:
+                    message = parse_binary_audio_frame(frame["bytes"])
+                except ValueError as e:
+                    logger.error(f"[SESSION {session_id}] Invalid binary frame: {str(e)}")
+                    await outbox.put({
+                        "type": "error",
+                        "message": f"Invalid binary audio frame: {str(e)}"
+                    })
+                    continue
+            else:
+                message = json.loads(frame["text"])
             
             logger.info(f"[SESSION {session_id}] MESSAGE {total_messages} RECEIVED - Type: {message.get('type', 'unknown')}")
             
             if message["type"] == "init":
                 # Handle initialization message with username
                 username = message.get("username", "unknown")
-                logger.info(f"[SESSION {session_id}] INITIALIZED with username: {username}")
+                binary_audio = bool(message.get("binary_audio", False))
+                stream_mode = message.get("mode") == "stream"
+                segmenter = StreamingSegmenter() if stream_mode else None
+                try:
+                    decode_profile = validate_decode_profile(message.get("profile", DEFAULT_DECODE_PROFILES["websocket"]))
+                except ValueError as e:
+                    # Keep the session usable with the default profile, but tell the client
+                    await outbox.put({"type": "error", "message": str(e)})
+                drafts = bool(message.get("drafts", ENABLE_DRAFT_CASCADE)) and draft_transcriber.active
+                logger.info(f"[SESSION {session_id}] INITIALIZED with username: {username}, binary audio: {binary_audio}, mode: {'stream' if stream_mode else 'chunked'}, profile: {decode_profile}, drafts: {drafts}")
                 
                 # Increment session count for this user
                 session_count = get_next_session_count(username)
@@ -1732,19 +3129,32 @@ async def websocket_endpoint(websocket: WebSocket):
                     new_session_dir = old_session_dir
                 
                 # Send acknowledgment
-                await websocket.send_json({
+                await outbox.put({
                     "type": "initialized",
                     "username": username,
                     "session_id": session_id,
-                    "session_count": session_count
+                    "session_count": session_count,
+                    "binary_audio": binary_audio,
+                    "audio_formats": ["wav", "ogg", "webm"],  # WAV or Opus in OGG/WebM, sniffed per chunk
+                    "mode": "stream" if segmenter else "chunked",
+                    "stream_format": "pcm_s16le_16000_mono" if segmenter else None,
+                    "profile": decode_profile,
+                    "profiles": [*DECODE_PROFILES, *TWO_PASS_PROFILES],
+                    "drafts": drafts,  # Draft results arrive as "transcription" with "draft": true, then the final replaces them
+                    # Credit window: keep at most "window" chunks awaiting transcription, pause on "slow_down"
+                    # until "resume"; chunks sent anyway are spilled to disk, never dropped
+                    "flow_control": {
+                        "window": FLOW_CONTROL_WINDOW,
+                        "slow_down_at": FLOW_SLOW_DOWN_DEPTH,
+                        "resume_at": FLOW_RESUME_DEPTH
+                    }
                 })
                 
             elif message["type"] == "audio":
                 chunk_counter += 1
-                # Log audio reception
-                audio_bytes = base64.b64decode(message["data"])
+                # Log audio reception - binary frames carry raw bytes, JSON messages carry base64
+                audio_bytes = message["audio_bytes"] if "audio_bytes" in message else base64.b64decode(message["data"])
                 audio_size = len(audio_bytes)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
                 
                 # Extract ICU data from message
                 icu_data = {
@@ -1755,58 +3165,51 @@ async def websocket_endpoint(websocket: WebSocket):
                     "username": message.get("username", username)
                 }
                 
-                logger.info(f"[SESSION {session_id}] AUDIO CHUNK {chunk_counter} RECEIVED - Size: {audio_size} bytes, Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                logger.info(f"[SESSION {session_id}] AUDIO CHUNK {chunk_counter} RECEIVED - Size: {audio_size} bytes, Binary: {'audio_bytes' in message}, Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
                 logger.info(f"[SESSION {session_id}] ICU DATA - Patient: {icu_data['patient']['name'] if icu_data['patient'] else 'None'}, Ward: {icu_data['ward']['desc'] if icu_data['ward'] else 'None'}, User: {icu_data['user']['loginname'] if icu_data['user'] else 'None'}, Assessment: {icu_data['assessment']['title'] if icu_data['assessment'] else 'None'}")
 
-                # Save audio chunk to file immediately with safe path handling
-                chunk_filename = f"chunk_{chunk_counter}_{timestamp}.wav"
-                try:
-                    chunk_filepath = safe_path_join(session_audio_dir, chunk_filename)
-                except ValueError as e:
-                    logger.error(f"[SESSION {session_id}] Invalid filename: {str(e)}")
-                    await websocket.send_json({
+                enqueue_chunk(chunk_counter, audio_bytes, icu_data)
+
+            elif message["type"] == "pcm":
+                # Streaming mode: continuous PCM frames, segmented server-side on VAD pauses
+                if segmenter is None:
+                    await outbox.put({
                         "type": "error",
-                        "message": f"Invalid filename for chunk {chunk_counter}",
-                        "chunk": chunk_counter
+                        "message": "PCM frames require \"mode\": \"stream\" in the init message"
                     })
                     continue
                 
-                try:
-                    with open(chunk_filepath, 'wb') as audio_file:
-                        audio_file.write(audio_bytes)
-                        audio_file.flush()             # Force flush buffers
-                        os.fsync(audio_file.fileno())  # Force flush to disk at OS level
-                    # File is now fully flushed and closed
-                    
-                    logger.info(f"[SESSION {session_id}] AUDIO CHUNK {chunk_counter} SAVED - File: {chunk_filename}")
-                    logger.info(f"[SESSION {session_id}] AUDIO CHUNK {chunk_counter} SAVED - Path: {chunk_filepath}")
-
-                    # Send acknowledgment back to client
-                    await websocket.send_json({
-                        "type": "audio_received",
-                        "chunk": chunk_counter,
-                        "filename": chunk_filename
-                    })
-                    
-                    # Small delay to ensure file is fully written before processing
-                    await asyncio.sleep(0.5)
-                    
-                    # Add to processing queue (background processing) with ICU data
-                    audio_processor.add_chunk_to_queue(session_id, chunk_filepath, chunk_counter, icu_data)
-                    
-                except Exception as save_error:
-                    logger.error(f"[SESSION {session_id}] FAILED TO SAVE AUDIO CHUNK {chunk_counter}: {str(save_error)}")
-                    await websocket.send_json({
-                        "type": "error",
-                        "message": f"Failed to save chunk {chunk_counter}",
-                        "chunk": chunk_counter
-                    })
+                pcm_bytes = message["audio_bytes"] if "audio_bytes" in message else base64.b64decode(message["data"])
+                for key in ("patient", "ward", "user", "assessment"):
+                    if message.get(key) is not None:
+                        stream_icu_data[key] = message[key]
+                stream_icu_data["username"] = message.get("username", username)
+                
+                for event, segment_audio in segmenter.push_pcm(pcm_bytes):
+                    if event == "final":
+                        chunk_counter += 1
+                        logger.info(f"[SESSION {session_id}] STREAM SEGMENT {chunk_counter} - {len(segment_audio) / 16000:.2f}s")
+                        enqueue_chunk(chunk_counter, encode_wav_pcm16(segment_audio), dict(stream_icu_data))
+                    elif (partial_task is None or partial_task.done()) and audio_processor.has_idle_worker():
+                        # Partials only use spare inference capacity, finals always win
+                        partial_task = asyncio.create_task(
+                            send_stream_partial(session_id, outbox, chunk_counter + 1, segment_audio)
+                        )
 
             elif message["type"] == "end":
+                if segmenter is not None:
+                    # Close the utterance still open at the end of the stream
+                    for event, segment_audio in segmenter.flush():
+                        chunk_counter += 1
+                        enqueue_chunk(chunk_counter, encode_wav_pcm16(segment_audio), dict(stream_icu_data))
+                
                 logger.info(f"[SESSION {session_id}] SESSION ENDED - Total messages: {total_messages}, Total chunks: {chunk_counter}, Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
                 
+                # The last utterance was only just queued - its transcription has to reach the client before the socket closes
+                await audio_processor.wait_for_session_chunks(session_id)
+                
                 # Send final acknowledgment
-                await websocket.send_json({
+                await outbox.put({
                     "type": "session_complete",
                     "total_chunks": chunk_counter,
                     "session_id": session_id
@@ -1815,10 +3218,12 @@ async def websocket_endpoint(websocket: WebSocket):
                 # Mark session as complete for background processing
                 audio_processor.mark_session_complete(session_id)
                 
+                # Let queued messages reach the client before the connection is closed
+                await flush_outbox(session_id, outbox)
                 break
             elif message["type"] == "ping":
                 # Handle ping messages for connection keep-alive
-                await websocket.send_json({
+                await outbox.put({
                     "type": "pong",
                     "chunk_id": message.get("chunk_id", 0),
                     "timestamp": int(datetime.now().timestamp() * 1000)
@@ -1839,12 +3244,120 @@ async def websocket_endpoint(websocket: WebSocket):
         except:
             pass
     finally:
+        sender_task.cancel()
+        if partial_task is not None:
+            partial_task.cancel()
+        
         # Clean up session resources
         try:
             await cleanup_session(session_id)
         except Exception as cleanup_error:
             logger.error(f"[SESSION {session_id}] Error during cleanup: {str(cleanup_error)}")
 
+def parse_binary_audio_frame(frame: bytes) -> dict:
+    """
+    Parse a binary audio frame from /ws/transcribe
+    
+    Layout: 4-byte big-endian header length, UTF-8 JSON header with the same metadata
+    fields as a JSON "audio" message (chunk, patient, ward, user, assessment, username),
+    then the raw WAV/PCM bytes. A header "type" of "pcm" marks a streaming-mode frame of
+    raw 16 kHz mono s16le samples; anything else is treated as an "audio" chunk.
+    
+    Returns:
+        An "audio" or "pcm" message dict with the raw bytes under "audio_bytes"
+    """
+    if len(frame) < BINARY_FRAME_PREFIX.size:
+        raise ValueError("frame shorter than header length prefix")
+    (header_length,) = BINARY_FRAME_PREFIX.unpack_from(frame, 0)
+    audio_offset = BINARY_FRAME_PREFIX.size + header_length
+    if audio_offset > len(frame):
+        raise ValueError(f"header length {header_length} exceeds frame size {len(frame)}")
+    
+    header = {}
+    if header_length:
+        try:
+            header = json.loads(frame[BINARY_FRAME_PREFIX.size:audio_offset].decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"invalid JSON header: {str(e)}")
+        if not isinstance(header, dict):
+            raise ValueError("JSON header must be an object")
+    
+    message = dict(header)
+    message["type"] = "pcm" if header.get("type") == "pcm" else "audio"
+    message["audio_bytes"] = frame[audio_offset:]
+    return message
+
+async def send_stream_partial(session_id: str, outbox: asyncio.Queue, chunk_id: int, audio):
+    """Transcribe the utterance heard so far and push it as a partial hypothesis"""
+    try:
+        # A live job outside the session's own queue, so it never counts against its flow-control window;
+        # on timeout the job is cancelled and skipped if it has not started
+        result = await asyncio.wait_for(
+            audio_processor.transcribe_decoded(audio, DEFAULT_DECODE_PROFILES["partial"],
+                                               priority="live", label=f"partial {chunk_id}", queue_id=f"{session_id}_partial"),
+            timeout=STREAM_PARTIAL_TIMEOUT_SECONDS
+        )
+        text = result.get("text", "").strip()
+        if text:
+            await outbox.put({
+                "type": "partial",
+                "chunk_id": chunk_id,  # The final "transcription" for this utterance reuses this chunk_id
+                "text": text,
+                "timestamp": int(datetime.now().timestamp() * 1000)
+            })
+    except Exception as e:
+        logger.warning(f"[SESSION {session_id}] Partial hypothesis failed: {str(e)}")
+
+async def websocket_sender(session_id: str, websocket: WebSocket, outbox: asyncio.Queue):
+    """Dedicated sender task: push each outbox message to the client as soon as it is queued"""
+    while True:
+        msg = await outbox.get()
+        try:
+            if msg.get('draft') and audio_processor.is_draft_superseded(session_id, msg.get('chunk_id')):
+                # The final for this chunk is already queued behind it - don't flash a stale draft
+                continue
+            await websocket.send_json(msg)
+            if msg.get('type') == 'transcription':
+                logger.info(f"[SESSION {session_id}] Pushed transcription for chunk {msg.get('chunk_id')}: {msg.get('text')}")
+        except Exception as e:
+            logger.error(f"[SESSION {session_id}] Failed to push message: {str(e)}")
+            audio_processor.mark_websocket_disconnected(session_id)
+        finally:
+            outbox.task_done()
+
+async def flush_outbox(session_id: str, outbox: asyncio.Queue, timeout: float = 5.0):
+    """Wait for the sender task to deliver everything queued so far"""
+    try:
+        await asyncio.wait_for(outbox.join(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"[SESSION {session_id}] Outbox not drained within {timeout}s - {outbox.qsize()} messages left")
+
+def make_chunk_saved_callback(session_id: str, chunk_number: int, chunk_filename: str, chunk_filepath: str):
+    """Build the writer callback that acks (or reports) a persisted chunk to its websocket"""
+    def on_done(error):
+        if error is None:
+            logger.info(f"[SESSION {session_id}] AUDIO CHUNK {chunk_number} SAVED - File: {chunk_filename}")
+            logger.info(f"[SESSION {session_id}] AUDIO CHUNK {chunk_number} SAVED - Path: {chunk_filepath}")
+            
+            # Send acknowledgment back to client
+            audio_processor.push_message(session_id, {
+                "type": "audio_received",
+                "chunk": chunk_number,
+                "filename": chunk_filename,
+                "credits": audio_processor.session_credits(session_id)
+            })
+        else:
+            logger.error(f"[SESSION {session_id}] FAILED TO SAVE AUDIO CHUNK {chunk_number}: {str(error)}")
+            audio_processor.push_message(session_id, {
+                "type": "error",
+                "message": f"Failed to save chunk {chunk_number}",
+                "chunk": chunk_number
+            })
+    return on_done
+
+# Binary websocket frames start with the JSON header length
+BINARY_FRAME_PREFIX = struct.Struct(">I")
+
 # Global variables for WebSocket connections and processing
 active_connections = []
 processing_lock = threading.Lock()
@@ -1862,41 +3375,671 @@ def get_next_session_count(username: str) -> int:
         user_session_counts[username] += 1
         return user_session_counts[username]
 
-def get_current_session_count(username: str) -> int:
-    """Get the current session count for a user without incrementing"""
-    with user_session_counts_lock:
-        return user_session_counts.get(username, 0)
+def get_current_session_count(username: str) -> int:
+    """Get the current session count for a user without incrementing"""
+    with user_session_counts_lock:
+        return user_session_counts.get(username, 0)
+
+class ChunkJob:
+    """
+    One chunk's trip through the pipeline: ingestion, decode, inference, persistence, delivery
+    
+    Carries the PCM, its duration/sample rate/content hash and the ICU context once,
+    so later stages read them instead of re-decoding files or rebuilding dicts.
+    """
+    __slots__ = (
+        "session_id", "username", "session_count", "chunk_number", "filepath", "icu_context", "profile",
+        "audio_bytes", "audio", "sample_rate", "duration", "content_hash",
+        "draft", "draft_delivered", "final_delivered", "priority", "deadline", "future",
+        "timestamp", "enqueued_at", "queue_wait_ms", "degraded", "on_segment"
+    )
+    
+    def __init__(self, session_id: str, chunk_number: int, filepath: str, icu_data: dict = None,
+                 username: str = "unknown", session_count: int = 1, audio_bytes: bytes = None,
+                 profile: str = DEFAULT_DECODE_PROFILES["websocket"], draft: bool = False,
+                 priority: str = "live", future: Future = None):
+        icu_data = icu_data or {}
+        self.session_id = session_id
+        self.username = username
+        self.session_count = session_count
+        self.chunk_number = chunk_number
+        self.filepath = filepath
+        self.profile = profile  # Decode profile the chunk is transcribed with
+        self.draft = draft  # Push a draft from the cascade's small model before the final
+        self.draft_delivered = False
+        self.final_delivered = False
+        self.icu_context = {
+            "patient": icu_data.get("patient"),
+            "ward": icu_data.get("ward"),
+            "user": icu_data.get("user"),
+            "assessment": icu_data.get("assessment"),
+            "username": icu_data.get("username", username)
+        }
+        self.audio_bytes = audio_bytes  # Encoded payload handed over in memory, dropped once decoded
+        self.audio = None  # Decoded mono float32 PCM
+        self.sample_rate = 16000
+        self.duration = None
+        self.content_hash = None
+        self.timestamp = datetime.now()
+        self.enqueued_at = time.monotonic()
+        self.queue_wait_ms = 0.0
+        self.priority = priority  # Scheduler class: "live", "reprocess" or "bulk"
+        self.deadline = self.enqueued_at + CHUNK_DEADLINE_SECONDS[priority]
+        self.future = future  # Set for submitted jobs: the result goes here instead of to a session
+        self.degraded = None  # Set by the load controller when the chunk is decoded below its requested quality
+        self.on_segment = None  # Submitted jobs only: called with each segment as it decodes (None = second pass restart)
+    
+    def set_audio(self, audio):
+        """Attach decoded PCM, deriving duration and a format-independent content hash from it"""
+        self.audio = audio
+        self.audio_bytes = None
+        self.duration = len(audio) / self.sample_rate
+        self.content_hash = hashlib.blake2b(memoryview(np.ascontiguousarray(audio)).cast("B"), digest_size=16).hexdigest()
+    
+    def release_audio(self, recycle: bool = True):
+        """
+        Drop the PCM once inference is done; metadata stays for persistence and delivery
+        
+        recycle=False keeps the buffer out of the pool, for when an abandoned
+        (timed out) inference call may still be reading it.
+        """
+        if recycle:
+            audio_buffer_pool.release(self.audio)
+        self.audio = None
+        self.audio_bytes = None
+
+
+class DraftTranscriber:
+    """Instant draft transcriptions from a small model, pushed ahead of the final result of the main model"""
+    
+    def __init__(self, enabled: bool, model_name: str, cpu_threads: int, profile: str, max_pending: int, final_slots: int = 1):
+        self.enabled = enabled
+        self.model_name = model_name
+        self.cpu_threads = cpu_threads
+        self.profile = profile
+        self.max_pending = max_pending
+        self.final_slots = final_slots
+        self.model = None
+        self.executor = None
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.finals_in_flight = 0
+        self.completed_drafts = 0
+        self.skipped_drafts = 0
+    
+    @property
+    def active(self):
+        """Whether drafts can be produced right now"""
+        return self.executor is not None
+    
+    def start(self):
+        """Load the draft model and its worker thread (no-op when the cascade is disabled)"""
+        if not self.enabled or self.executor is not None:
+            return
+        try:
+            # One model worker for the draft thread plus one per final slot, so finals decode side by side
+            self.model = load_whisper_model(cpu_threads=self.cpu_threads, num_workers=self.final_slots + 1, model_name=self.model_name)
+        except Exception as e:
+            logger.error(f"[DRAFT] Draft model unavailable, continuing without drafts: {str(e)}")
+            return
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="draft")
+        logger.info(f"[DRAFT] Draft cascade enabled with {self.model_name}")
+    
+    def submit(self, audio, on_done):
+        """Transcribe a copy of the audio in the background and call on_done(result); False if skipped"""
+        with self.lock:
+            if self.executor is None or self.pending >= self.max_pending:
+                self.skipped_drafts += 1
+                return False
+            self.pending += 1
+        # The caller's buffer goes back to the pool once the final is in, so the draft needs its own copy
+        future = self.executor.submit(self._transcribe, np.array(audio, dtype=np.float32, copy=True))
+        future.add_done_callback(lambda f: self._on_draft_done(f, on_done))
+        return True
+    
+    def _on_draft_done(self, future, on_done):
+        """Release the pending slot and hand a successful draft to the caller"""
+        with self.lock:
+            self.pending -= 1
+        if future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                logger.warning(f"[DRAFT] Draft transcription failed: {str(future.exception())}")
+            return
+        with self.lock:
+            self.completed_drafts += 1
+        on_done(future.result())
+    
+    def reserve_final(self):
+        """Claim a final slot on the draft model; False when they are all busy"""
+        with self.lock:
+            if self.executor is None or self.finals_in_flight >= self.final_slots:
+                return False
+            self.finals_in_flight += 1
+            return True
+    
+    def release_finals(self, count: int = 1):
+        """Give back final slots claimed with reserve_final"""
+        with self.lock:
+            self.finals_in_flight = max(0, self.finals_in_flight - count)
+    
+    def transcribe_sync(self, audio, profile: str):
+        """Transcribe a final result with the draft model in the caller's thread (the load controller's last step)"""
+        segments, info = self.model.transcribe(audio, **DECODE_PROFILES[profile])
+        segments_list = list(segments)
+        return {
+            "text": " ".join(segment.text for segment in segments_list).strip(),
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "confidence": info.language_probability,
+            "duration": len(audio) / 16000,
+            "profile": profile,
+            "segments": segments_list
+        }
+    
+    def _transcribe(self, audio):
+        """Run the draft model with the draft decode profile"""
+        segments, info = self.model.transcribe(audio, **DECODE_PROFILES[self.profile])
+        return {
+            "text": " ".join(segment.text for segment in segments).strip(),
+            "language": info.language,
+            "confidence": info.language_probability
+        }
+    
+    def stats(self):
+        """Get draft model state and counters"""
+        with self.lock:
+            return {
+                "enabled": self.active,
+                "model": self.model_name if self.active else None,
+                "pending": self.pending,
+                "finals_in_flight": self.finals_in_flight,
+                "completed_drafts": self.completed_drafts,
+                "skipped_drafts": self.skipped_drafts
+            }
+    
+    def shutdown(self):
+        """Stop the draft worker, dropping drafts that have not started"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+            logger.info("Draft transcriber stopped")
+
+
+class ChunkWriter:
+    """Background writer that persists audio chunks (write + fsync) off the websocket and decode paths"""
+    
+    def __init__(self):
+        self.write_queue = queue.Queue()
+        self.thread = None
+        self.running = False
+        self.written_chunks = 0
+        self.failed_chunks = 0
+    
+    def start(self):
+        """Start the writer thread"""
+        if not self.running:
+            self.running = True
+            self.thread = threading.Thread(target=self._write_loop, daemon=True, name="chunk-writer")
+            self.thread.start()
+            logger.info("Chunk writer thread started")
+    
+    def stop(self):
+        """Write everything still queued, then stop the writer thread"""
+        if self.running:
+            self.running = False
+            self.write_queue.put(None)
+            self.thread.join()
+            logger.info("Chunk writer thread stopped")
+    
+    def write(self, filepath: str, data: bytes, on_done=None, transcode_to_wav: bool = False):
+        """Queue a file for durable writing; on_done(error) is called from the writer thread
+        
+        With transcode_to_wav the compressed payload is decoded and stored as 16kHz PCM WAV.
+        """
+        self.write_queue.put((filepath, data, on_done, transcode_to_wav))
+    
+    def pending(self):
+        """Number of writes still waiting for the disk"""
+        return self.write_queue.qsize()
+    
+    def _write_loop(self):
+        """Drain the write queue until stopped"""
+        while True:
+            item = self.write_queue.get()
+            if item is None:
+                break
+            filepath, data, on_done, transcode_to_wav = item
+            error = None
+            try:
+                if transcode_to_wav:
+                    data = encode_wav_pcm16(decode_compressed_audio(data))
+                with open(filepath, 'wb') as audio_file:
+                    audio_file.write(data)
+                    audio_file.flush()             # Force flush buffers
+                    os.fsync(audio_file.fileno())  # Force flush to disk at OS level
+                # File is now fully flushed and closed
+                self.written_chunks += 1
+            except Exception as e:
+                error = e
+                self.failed_chunks += 1
+            if on_done:
+                try:
+                    on_done(error)
+                except Exception as callback_error:
+                    logger.error(f"[WRITER] Callback failed for {filepath}: {str(callback_error)}")
+
+class ProcessorShutdown(RuntimeError):
+    """Raised to submitted jobs the AudioProcessor stopped before transcribing; journaled work resumes on the next start"""
+
+
+class ChunkScheduler:
+    """
+    Fair queue for the AudioProcessor: per-session sub-queues served round-robin within
+    priority classes (live > reprocess > bulk), with per-chunk deadlines that let an
+    overdue lower class take every other turn so it is never starved
+    
+    Not thread-safe on its own - callers hold the processor's queue lock.
+    """
+    
+    def __init__(self, priorities=CHUNK_PRIORITIES):
+        self.classes = {priority: OrderedDict() for priority in priorities}  # priority -> {session_id: deque of jobs}
+        self.size = 0
+        self.missed_deadlines = defaultdict(int)
+        self.wait_stats = {priority: {"count": 0, "total_ms": 0.0, "max_ms": 0.0} for priority in priorities}
+        self.last_pop_jumped = False  # Whether the previous pop served an overdue lower class
+    
+    def __len__(self):
+        return self.size
+    
+    def push(self, job):
+        """Queue a job at the back of its session's sub-queue"""
+        self.classes[job.priority].setdefault(job.session_id, deque()).append(job)
+        self.size += 1
+    
+    def queued_for(self, session_id: str, priority: str = "live"):
+        """Number of jobs a session has waiting in one priority class"""
+        return len(self.classes[priority].get(session_id, ()))
+    
+    def _next(self, now: float):
+        """
+        Pick (priority, session_id) of the next job: the next session in round-robin order within
+        the highest non-empty class, unless a lower class has overdue heads and the previous pop
+        was not already such a jump - then the next overdue session of that class, in its rotation
+        
+        Missed deadlines within the top class change nothing, so round-robin survives a backlog.
+        """
+        top = next(priority for priority, sessions in self.classes.items() if sessions)
+        if not self.last_pop_jumped:
+            priorities = list(self.classes)
+            for priority in priorities[priorities.index(top) + 1:]:
+                sessions = self.classes[priority]
+                session_id = next((session_id for session_id, jobs in sessions.items() if jobs[0].deadline <= now), None)
+                if session_id is not None:
+                    return priority, session_id
+        return top, next(iter(self.classes[top]))
+    
+    def oldest_wait_ms(self):
+        """How long the longest-waiting queued job has been waiting (session heads are their oldest jobs)"""
+        heads = [jobs[0].enqueued_at for sessions in self.classes.values() for jobs in sessions.values()]
+        return (time.monotonic() - min(heads)) * 1000 if heads else 0.0
+    
+    def peek(self):
+        """The job pop() would return next, left in the queue"""
+        priority, session_id = self._next(time.monotonic())
+        return self.classes[priority][session_id][0]
+    
+    def pop(self):
+        """Take the next job (see _next)"""
+        now = time.monotonic()
+        priority, session_id = self._next(now)
+        self.last_pop_jumped = priority != next(p for p, sessions in self.classes.items() if sessions)
+        
+        # Re-inserting the session moves it to the back of the rotation
+        sessions = self.classes[priority]
+        jobs = sessions.pop(session_id)
+        job = jobs.popleft()
+        if jobs:
+            sessions[session_id] = jobs
+        self.size -= 1
+        
+        job.queue_wait_ms = (now - job.enqueued_at) * 1000
+        wait_stats = self.wait_stats[priority]
+        wait_stats["count"] += 1
+        wait_stats["total_ms"] += job.queue_wait_ms
+        wait_stats["max_ms"] = max(wait_stats["max_ms"], job.queue_wait_ms)
+        if now > job.deadline:
+            self.missed_deadlines[priority] += 1
+        return job
+    
+    def stats(self):
+        """Queue depth, waiting sessions, queue-wait times and missed deadlines per priority class"""
+        return {
+            priority: {
+                "queued": sum(len(jobs) for jobs in sessions.values()),
+                "sessions_waiting": len(sessions),
+                "deadline_seconds": CHUNK_DEADLINE_SECONDS[priority],
+                "missed_deadlines": self.missed_deadlines[priority],
+                "avg_queue_wait_ms": round(self.wait_stats[priority]["total_ms"] / self.wait_stats[priority]["count"], 1) if self.wait_stats[priority]["count"] else 0.0,
+                "max_queue_wait_ms": round(self.wait_stats[priority]["max_ms"], 1)
+            }
+            for priority, sessions in self.classes.items()
+        }
+
+
+class WorkerAutoscaler:
+    """
+    Decides how many AudioProcessor workers should be pulling chunks, between min and max
+    
+    Scales up from queue depth and the p95 queue wait when the CPU has headroom, and down
+    one worker at a time once the queue has stayed empty for AUTOSCALE_DOWN_IDLE_SECONDS.
+    """
+    
+    def __init__(self, min_workers: int, max_workers: int, enabled: bool = ENABLE_AUTOSCALE):
+        self.enabled = enabled
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.lock = threading.Lock()
+        self.queue_waits = []  # Queue waits (ms) of chunks taken since the last evaluation
+        self.last_busy = time.monotonic()
+        self.last_signals = {}
+        self.decisions = deque(maxlen=AUTOSCALE_HISTORY)
+    
+    @property
+    def initial_workers(self):
+        """Workers to start with"""
+        return self.min_workers if self.enabled else self.max_workers
+    
+    def record_wait(self, queue_wait_ms: float):
+        """Feed the queue wait of a chunk just taken by a worker"""
+        with self.lock:
+            self.queue_waits.append(queue_wait_ms)
+    
+    def decide(self, active: int, queue_depth: int, cpu_percent: float, oldest_wait_ms: float = 0.0):
+        """
+        Return the worker count for the current signals, recording any change and its reason
+        
+        The wait signal is the p95 of chunks taken since the last evaluation or the age of the
+        oldest chunk still queued, whichever is worse - when every worker is stuck on a long
+        decode nothing is taken, but the queued chunks keep ageing.
+        """
+        with self.lock:
+            waits = sorted(self.queue_waits)
+            self.queue_waits = []
+        taken_p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        wait_ms = max(taken_p95, oldest_wait_ms)
+        now = time.monotonic()
+        if queue_depth > 0:
+            self.last_busy = now
+        self.last_signals = {
+            "queue_depth": queue_depth,
+            "queue_wait_p95_ms": round(taken_p95, 1),
+            "oldest_queued_ms": round(oldest_wait_ms, 1),
+            "cpu_percent": cpu_percent
+        }
+        if not self.enabled:
+            return active
+        
+        target, reason = active, None
+        wanted = -(-queue_depth // AUTOSCALE_QUEUE_DEPTH_PER_WORKER)  # One worker per few queued chunks
+        if wait_ms >= AUTOSCALE_UP_WAIT_P95_MS:
+            wanted = max(wanted, active + 1)
+        if wanted > active and active < self.max_workers and queue_depth > 0:
+            if cpu_percent is not None and cpu_percent >= AUTOSCALE_MAX_CPU_PERCENT:
+                reason = f"held at {active}: CPU at {cpu_percent:.0f}%"
+            else:
+                target = min(wanted, self.max_workers)
+                reason = f"queue depth {queue_depth}, wait {wait_ms:.0f} ms"
+        elif active > self.min_workers and queue_depth == 0 and now - self.last_busy >= AUTOSCALE_DOWN_IDLE_SECONDS:
+            target = active - 1
+            reason = f"queue empty for {now - self.last_busy:.0f}s"
+            self.last_busy = now  # Retire one worker per idle period
+        
+        if reason is not None and (target != active or not self.decisions or self.decisions[-1]["reason"] != reason):
+            self.decisions.append({
+                "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "from": active,
+                "to": target,
+                "reason": reason,
+                **self.last_signals
+            })
+            if target != active:
+                logger.info(f"[AUTOSCALE] {active} -> {target} workers ({reason})")
+        return target
+    
+    def stats(self, active: int):
+        """Bounds, current workers, last signals and recent decisions for /server-status"""
+        return {
+            "enabled": self.enabled,
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "active_workers": active,
+            "signals": self.last_signals,
+            "decisions": list(self.decisions)
+        }
+
+
+class LoadController:
+    """
+    Picks the decoding quality level from queue depth and the measured real-time factor
+    
+    Steps down straight to the level the worse signal calls for, and back up one level
+    at a time once both signals have stayed well below that level's watermarks.
+    """
+    
+    def __init__(self, enabled: bool = ENABLE_LOAD_SHEDDING):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.level = 0
+        self.level_since = time.monotonic()
+        self.decode_times = deque(maxlen=LOAD_RTF_WINDOW)  # (decode seconds, audio seconds) per call
+        self.queue_depth = 0
+        self.transitions = []  # Recent level changes for /server-status
+        self.degraded_chunks = defaultdict(int)  # level name -> chunks decoded at it below their requested profile
+        self.seconds_at_level = defaultdict(float)
+    
+    def record_decode(self, decode_seconds: float, audio_seconds: float):
+        """Feed one main-model decode call into the real-time factor"""
+        if audio_seconds > 0:
+            with self.lock:
+                self.decode_times.append((decode_seconds, audio_seconds))
+    
+    def _real_time_factor(self):
+        """Decode time over audio time across the recent window (lock must be held)"""
+        audio_seconds = sum(audio for _, audio in self.decode_times)
+        return sum(decode for decode, _ in self.decode_times) / audio_seconds if audio_seconds else 0.0
+    
+    def update(self, queue_depth: int):
+        """Re-evaluate the level for the current queue depth and return its name"""
+        if not self.enabled:
+            return LOAD_LEVELS[0]
+        now = time.monotonic()
+        with self.lock:
+            self.queue_depth = queue_depth
+            rtf = self._real_time_factor()
+            target = 0
+            for level, (depth_mark, rtf_mark) in enumerate(zip(LOAD_QUEUE_WATERMARKS, LOAD_RTF_WATERMARKS), start=1):
+                if queue_depth >= depth_mark or rtf >= rtf_mark:
+                    target = level
+            if target > self.level:
+                self._set_level(target, now, queue_depth, rtf)
+            elif self.level > 0 and now - self.level_since >= LOAD_MIN_HOLD_SECONDS:
+                depth_mark = LOAD_QUEUE_WATERMARKS[self.level - 1] * LOAD_RECOVERY_RATIO
+                rtf_mark = LOAD_RTF_WATERMARKS[self.level - 1] * LOAD_RECOVERY_RATIO
+                if queue_depth < depth_mark and rtf < rtf_mark:
+                    self._set_level(self.level - 1, now, queue_depth, rtf)
+            return LOAD_LEVELS[self.level]
+    
+    def _set_level(self, level: int, now: float, queue_depth: int, rtf: float):
+        """Switch level and log the transition (lock must be held)"""
+        self.seconds_at_level[LOAD_LEVELS[self.level]] += now - self.level_since
+        direction = "down" if level > self.level else "up"
+        logger.warning(f"[LOAD] Stepping {direction} to '{LOAD_LEVELS[level]}' - queue depth {queue_depth}, real-time factor {rtf:.2f}")
+        self.transitions.append({
+            "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "from": LOAD_LEVELS[self.level],
+            "to": LOAD_LEVELS[level],
+            "queue_depth": queue_depth,
+            "real_time_factor": round(rtf, 2)
+        })
+        del self.transitions[:-20]
+        self.level = level
+        self.level_since = now
+        # Decode times measured at the old level's profiles say nothing about the new one
+        self.decode_times.clear()
+    
+    def degrade(self, job, level_name: str):
+        """Switch a job to the level's profile (and model), recording what it asked for; returns the model to use"""
+        if level_name == LOAD_LEVELS[0]:
+            return None
+        profile = DEGRADED_PROFILES[level_name].get(job.profile, job.profile)
+        # The draft model only takes what its slots can run at once - funnelling every worker
+        # through it would serialize them; overflow stays on the main model at the level's profile
+        model = draft_transcriber.model_name if level_name == "draft_model" and draft_transcriber.reserve_final() else None
+        if profile == job.profile and model is None:
+            return None
+        job.degraded = {
+            "level": level_name,
+            "requested_profile": job.profile,
+            "profile": profile,
+            "model": model or WHISPER_MODEL_NAME
+        }
+        job.profile = profile
+        with self.lock:
+            self.degraded_chunks[level_name] += 1
+        return model
+    
+    def stats(self):
+        """Current level, its signals, time spent per level and degraded chunk counts"""
+        with self.lock:
+            seconds_at_level = dict(self.seconds_at_level)
+            seconds_at_level[LOAD_LEVELS[self.level]] = seconds_at_level.get(LOAD_LEVELS[self.level], 0.0) + time.monotonic() - self.level_since
+            return {
+                "enabled": self.enabled,
+                "level": LOAD_LEVELS[self.level],
+                "queue_depth": self.queue_depth,
+                "real_time_factor": round(self._real_time_factor(), 3),
+                "seconds_at_level": {name: round(seconds, 1) for name, seconds in seconds_at_level.items()},
+                "degraded_chunks": dict(self.degraded_chunks),
+                "transitions": list(self.transitions)
+            }
+
 
 class AudioProcessor:
-    def __init__(self):
+    def __init__(self, num_workers: int = 1):
         self.running = False
-        self.thread = None
+        self.num_workers = num_workers  # Processing threads the inference pool can keep busy at most
+        self.autoscaler = WorkerAutoscaler(AUTOSCALE_MIN_WORKERS, min(AUTOSCALE_MAX_WORKERS, num_workers))
+        self.target_workers = 0  # Worker threads with an index below this keep taking chunks
+        self.busy_workers = 0  # Worker threads between taking a batch and finishing it (queue lock)
+        self.threads = {}  # worker index -> processing thread
+        self.autoscale_thread = None
         self.processed_files = set()
         self.sessions = {}  # Store session info: {session_id: {dir, websocket, chunks, complete}}
-        self.processing_queue = []  # Queue of chunks to process
+        self.processing_queue = ChunkScheduler()  # Fair, priority-aware queue of chunks to process
+        self.spilled = defaultdict(deque)  # session_id -> chunks waiting on disk for room in the scheduler (queue lock)
+        self.spilled_chunks = 0
+        self.load_controller = LoadController()  # Steps decode quality down under load
         self.session_lock = threading.Lock()
         self.queue_lock = threading.Lock()
-        self.max_queue_size = 20  # Prevent queue from growing too large
-        self.processing_semaphore = threading.Semaphore(2)  # Limit concurrent processing
+        self.queue_condition = threading.Condition(self.queue_lock)  # Wakes workers as soon as a chunk is queued
+        self.draft_lock = threading.Lock()  # Orders draft pushes against their final result
+        self.housekeeping_thread = None
+        self.stop_event = threading.Event()
+        self.last_queue_wait_ms = 0.0
+        self.max_queue_wait_ms = 0.0
+        self.max_queue_size = 500  # Hard cap across all sessions and classes
         self.session_cleanup_interval = 300  # Clean up old sessions every 5 minutes
         self.last_cleanup = time.time()
         
     def start(self):
-        """Start the audio processing thread"""
+        """Start the audio processing threads"""
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self._process_loop, daemon=True)
-            self.thread.start()
-            logger.info("Audio processing thread started")
+            self.threads = {}
+            self.stop_event.clear()
+            self.set_worker_count(self.autoscaler.initial_workers)
+            self.housekeeping_thread = threading.Thread(target=self._housekeeping_loop, daemon=True, name="audio-processor-housekeeping")
+            self.housekeeping_thread.start()
+            if self.autoscaler.enabled:
+                self.autoscale_thread = threading.Thread(target=self._autoscale_loop, daemon=True, name="audio-processor-autoscaler")
+                self.autoscale_thread.start()
+            logger.info(f"Audio processing threads started ({self.target_workers} of up to {self.autoscaler.max_workers} workers)")
     
-    def stop(self):
-        """Stop the audio processing thread"""
+    def set_worker_count(self, count: int):
+        """Start or retire processing threads so that `count` of them take chunks"""
+        with self.queue_condition:
+            self.target_workers = count
+            # Retiring workers finish their current batch, then leave _take_batch
+            self.queue_condition.notify_all()
+        # Busy workers share the cores instead of each getting a fixed 1/max slice
+        inference_executor.fit_threads_to_workers(count)
+        for worker_index in range(count):
+            thread = self.threads.get(worker_index)
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=self._process_loop, args=(worker_index,), daemon=True, name=f"audio-processor-{worker_index}")
+                thread.start()
+                self.threads[worker_index] = thread
+    
+    def active_workers(self):
+        """Processing threads currently taking chunks"""
+        return sum(1 for worker_index, thread in list(self.threads.items()) if worker_index < self.target_workers and thread.is_alive())
+    
+    def _autoscale_loop(self):
+        """Re-evaluate the worker count on a timer"""
+        psutil.cpu_percent(interval=None)  # Prime the counter; later calls measure since the previous one
+        while not self.stop_event.wait(AUTOSCALE_INTERVAL_SECONDS):
+            try:
+                active = self.target_workers
+                with self.queue_lock:
+                    oldest_wait_ms = self.processing_queue.oldest_wait_ms()
+                target = self.autoscaler.decide(active, self.queue_depth(), psutil.cpu_percent(interval=None), oldest_wait_ms)
+                # Also replaces a worker that was retiring when it was asked to stay
+                if target != active or self.active_workers() < target:
+                    self.set_worker_count(target)
+            except Exception as e:
+                logger.error(f"Error in worker autoscaling: {str(e)}")
+    
+    def stop(self, drain_seconds: float = 0):
+        """Stop the audio processing threads, first draining the queue for up to drain_seconds
+        
+        Session chunks still queued afterwards stay unfinished in the work journal and are
+        replayed on the next start; submitted jobs still queued get ProcessorShutdown, which
+        journaled background uploads treat as "resume on next start", not as a failure.
+        """
+        if self.running and drain_seconds > 0:
+            deadline = time.monotonic() + drain_seconds
+            with self.queue_condition:
+                while (self.processing_queue or self.spilled) and time.monotonic() < deadline:
+                    self.queue_condition.wait(timeout=0.2)
+                remaining = len(self.processing_queue) + sum(len(spilled) for spilled in self.spilled.values())
+            if remaining:
+                logger.warning(f"[PROCESSOR] Drain timed out, {remaining} chunk(s) left for replay on next start")
+            else:
+                logger.info("[PROCESSOR] Queue drained before shutdown")
         self.running = False
-        if self.thread:
-            self.thread.join()
-            logger.info("Audio processing thread stopped")
+        self.stop_event.set()
+        with self.queue_condition:
+            self.queue_condition.notify_all()
+        for thread in self.threads.values():
+            thread.join()
+        if self.housekeeping_thread:
+            self.housekeeping_thread.join()
+            self.housekeeping_thread = None
+        if self.autoscale_thread:
+            self.autoscale_thread.join()
+            self.autoscale_thread = None
+        if self.threads:
+            logger.info("Audio processing threads stopped")
+        self.threads = {}
+        
+        with self.queue_condition:
+            leftovers = []
+            while self.processing_queue:
+                leftovers.append(self.processing_queue.pop())
+        for job in leftovers:
+            self._fail_submitted_job(job, ProcessorShutdown("Server shutting down before the audio was transcribed"))
     
-    def register_session(self, session_id: str, session_dir: str, websocket, username: str = None):
+    def register_session(self, session_id: str, session_dir: str, websocket, username: str = None, loop=None, outbox=None):
         """Register a new session for processing"""
         with self.session_lock:
             self.sessions[session_id] = {
@@ -1907,21 +4050,30 @@ class AudioProcessor:
                 'chunks': [],
                 'complete': False,
                 'websocket_active': True,
-                'pending_messages': [],
+                'loop': loop,  # Event loop owning the websocket, used to hand results over thread-safely
+                'outbox': outbox,  # asyncio.Queue drained by the session's sender task
+                'finalized_drafts': set(),  # Chunk ids whose final is queued; drafts still queued for them are dropped
+                'flow': {'paused': False, 'slow_downs': 0},  # Backpressure state, see _update_flow_control
                 'total_chunks': 0,
                 'processed_chunks': 0,
+                'in_flight_chunks': 0,  # Queued but not yet finished, see wait_for_session_chunks
+                'vad_stats': {
+                    'scored_chunks': 0,
+                    'skipped_chunks': 0,
+                    'audio_seconds': 0.0,
+                    'speech_seconds': 0.0,
+                    'chunks': deque(maxlen=VAD_STATS_HISTORY)  # Most recent per-chunk scores
+                },
                 'created_at': datetime.now()
             }
             logger.info(f"[PROCESSOR] Registered session {session_id} for user {username} - Total active sessions: {len(self.sessions)}")
     
-    def add_chunk_to_queue(self, session_id: str, chunk_filepath: str, chunk_number: int, icu_data: dict = None):
-        """Add a chunk to the processing queue with size limits and ICU data"""
-        # Check queue size limit
-        with self.queue_lock:
-            if len(self.processing_queue) >= self.max_queue_size:
-                logger.warning(f"[PROCESSOR] Queue full ({self.max_queue_size}), dropping chunk {chunk_number} for session {session_id}")
-                return
+    def add_chunk_to_queue(self, session_id: str, chunk_filepath: str, chunk_number: int, icu_data: dict = None, audio_bytes: bytes = None, profile: str = None, draft: bool = False):
+        """Add a chunk to the processing queue with size limits and ICU data
         
+        When audio_bytes is given the chunk is decoded from memory and the file at
+        chunk_filepath is only the durable copy (written by chunk_writer).
+        """
         # Get username from session info
         username = "unknown"
         session_count = 1
@@ -1941,8 +4093,8 @@ class AudioProcessor:
                             if potential_username and potential_username != 'session_' + session_id:
                                 username = potential_username
         
-        # Verify file exists before adding to queue (with retry)
-        max_retries = 5
+        # Verify file exists before adding to queue (with retry) - not needed for in-memory chunks
+        max_retries = 5 if audio_bytes is None else 0
         for attempt in range(max_retries):
             if os.path.exists(chunk_filepath):
                 logger.info(f"[PROCESSOR] File found on attempt {attempt + 1}: {chunk_filepath}")
@@ -1961,23 +4113,217 @@ class AudioProcessor:
                     logger.error(f"[PROCESSOR] Directory does not exist: {dir_path}")
                 return
         
-        with self.queue_lock:
-            self.processing_queue.append({
-                'session_id': session_id,
-                'username': username,
-                'session_count': session_count,
-                'filepath': chunk_filepath,
-                'chunk_number': chunk_number,
-                'icu_data': icu_data,
-                'timestamp': datetime.now()
-            })
+        job = ChunkJob(
+            session_id,
+            chunk_number,
+            chunk_filepath,
+            icu_data,
+            username=username,
+            session_count=session_count,
+            audio_bytes=audio_bytes,
+            profile=profile or DEFAULT_DECODE_PROFILES["websocket"],
+            draft=draft
+        )
+        # Journal first, so a crash from here on replays the chunk from its stored file
+        work_journal.chunk_enqueued(job)
+        
+        with self.queue_condition:
+            self._enqueue_job(job)
             
             # Update session info
             with self.session_lock:
                 if session_id in self.sessions:
                     self.sessions[session_id]['total_chunks'] = max(self.sessions[session_id]['total_chunks'], chunk_number)
+                    self.sessions[session_id]['in_flight_chunks'] += 1
             
             logger.info(f"[PROCESSOR] Added chunk {chunk_number} to queue for session {session_id} (user: {username}) - Queue size: {len(self.processing_queue)}")
+        
+        self._update_flow_control(session_id)
+    
+    def _enqueue_job(self, job):
+        """Push a session chunk to the scheduler, or spill it if the limits are reached (queue lock must be held)"""
+        session_id = job.session_id
+        if self.spilled.get(session_id) or not self._has_room_for(session_id):
+            # Never drop dictation: past the limits the chunk waits on disk (chunk_writer's durable
+            # copy) and is re-admitted in order as the session's backlog drains
+            job.audio_bytes = None
+            self.spilled[session_id].append(job)
+            self.spilled_chunks += 1
+            logger.warning(f"[PROCESSOR] Queue limit reached, spilled chunk {job.chunk_number} for session {session_id} to disk - Spilled: {len(self.spilled[session_id])}")
+        else:
+            self.processing_queue.push(job)
+            self.queue_condition.notify()
+    
+    def replay_journal(self):
+        """Re-queue session chunks the journal shows as unfinished from before the last shutdown or crash"""
+        pending = work_journal.pending_chunks(WORK_JOURNAL_REPLAY_MAX_AGE_HOURS)
+        replayed = 0
+        for chunk in pending:
+            session_id = chunk["session_id"]
+            chunk_number = chunk["chunk_number"]
+            if chunk["attempts"] > WORK_JOURNAL_MAX_ATTEMPTS:
+                logger.error(f"[PROCESSOR] Giving up on chunk {chunk_number} for session {session_id} after {chunk['attempts'] - 1} replays: {chunk['filepath']}")
+                work_journal.chunk_done(session_id, chunk_number)
+                continue
+            if not os.path.exists(chunk["filepath"]):
+                # Crashed before chunk_writer got it to disk - nothing left to transcribe
+                logger.warning(f"[PROCESSOR] Cannot replay chunk {chunk_number} for session {session_id}, file missing: {chunk['filepath']}")
+                work_journal.chunk_done(session_id, chunk_number)
+                continue
+            try:
+                icu_context = json.loads(chunk["icu_context"]) if chunk["icu_context"] else None
+            except ValueError:
+                icu_context = None
+            # The websocket is gone: the result goes to the transcription files, behind live traffic
+            job = ChunkJob(
+                session_id,
+                chunk_number,
+                chunk["filepath"],
+                icu_context,
+                username=chunk["username"] or "unknown",
+                session_count=chunk["session_count"] or 1,
+                profile=chunk["profile"] if chunk["profile"] in DECODE_PROFILES or chunk["profile"] in TWO_PASS_PROFILES else DEFAULT_DECODE_PROFILES["session"],
+                priority="reprocess"
+            )
+            with self.queue_condition:
+                self._enqueue_job(job)
+            replayed += 1
+        if pending:
+            logger.info(f"[PROCESSOR] Replayed {replayed} unfinished chunk(s) from the work journal ({len(pending) - replayed} skipped)")
+        return replayed
+    
+    def _has_room_for(self, session_id: str):
+        """Whether the scheduler can take another live chunk from this session (queue lock must be held)"""
+        return (len(self.processing_queue) < self.max_queue_size
+                and self.processing_queue.queued_for(session_id) < MAX_QUEUED_LIVE_CHUNKS_PER_SESSION)
+    
+    def _readmit_spilled(self):
+        """Move spilled chunks back into the scheduler while their sessions have room (queue lock must be held)"""
+        for session_id in list(self.spilled):
+            spilled = self.spilled[session_id]
+            while spilled and self._has_room_for(session_id):
+                # Read back from the durable copy; the original deadline stands, so it is served promptly
+                self.processing_queue.push(spilled.popleft())
+            if not spilled:
+                del self.spilled[session_id]
+    
+    def session_backlog(self, session_id: str):
+        """Chunks of a session waiting for transcription, in the scheduler or spilled to disk"""
+        with self.queue_lock:
+            return self.processing_queue.queued_for(session_id) + len(self.spilled.get(session_id, ()))
+    
+    def backlog_snapshot(self):
+        """Live chunks queued and spilled per session, for status reporting"""
+        with self.queue_lock:
+            return {
+                session_id: {
+                    "queued": self.processing_queue.queued_for(session_id),
+                    "spilled": len(self.spilled.get(session_id, ()))
+                }
+                for session_id in {*self.processing_queue.classes["live"], *self.spilled}
+            }
+    
+    def session_credits(self, session_id: str):
+        """Credits left in the session's flow-control window"""
+        return max(0, FLOW_CONTROL_WINDOW - self.session_backlog(session_id))
+    
+    def _update_flow_control(self, session_id: str):
+        """Send "slow_down" when a session's backlog crosses the high mark and "resume" once it drains"""
+        backlog = self.session_backlog(session_id)
+        message = None
+        with self.session_lock:
+            session_info = self.sessions.get(session_id)
+            if session_info is None:
+                return
+            flow = session_info['flow']
+            if not flow['paused'] and backlog >= FLOW_SLOW_DOWN_DEPTH:
+                flow['paused'] = True
+                flow['slow_downs'] += 1
+                message = {"type": "slow_down", "backlog": backlog, "credits": max(0, FLOW_CONTROL_WINDOW - backlog)}
+            elif flow['paused'] and backlog <= FLOW_RESUME_DEPTH:
+                flow['paused'] = False
+                message = {"type": "resume", "backlog": backlog, "credits": max(0, FLOW_CONTROL_WINDOW - backlog)}
+        if message is not None:
+            logger.info(f"[PROCESSOR] Flow control for session {session_id}: {message['type']} (backlog {backlog})")
+            self.push_message(session_id, message)
+    
+    def submit(self, job):
+        """Queue a job whose result should come back to the caller; returns a concurrent Future"""
+        job.future = Future()
+        with self.queue_condition:
+            if not self.running:
+                job.future.set_exception(ProcessorShutdown("Server shutting down, not accepting audio"))
+                return job.future
+            if len(self.processing_queue) >= self.max_queue_size:
+                job.future.set_exception(RuntimeError(f"Processing queue full ({self.max_queue_size})"))
+                return job.future
+            self.processing_queue.push(job)
+            self.queue_condition.notify()
+        return job.future
+    
+    async def transcribe_bytes(self, audio_bytes: bytes, profile: str, priority: str = "bulk", label: str = "upload"):
+        """Transcribe an in-memory upload through the fair scheduler at the given priority"""
+        job = ChunkJob(f"{priority}_{uuid.uuid4().hex}", 0, label, audio_bytes=audio_bytes, profile=profile, priority=priority)
+        return await asyncio.wrap_future(self.submit(job))
+    
+    async def transcribe_decoded(self, audio, profile: str, priority: str = "bulk", label: str = "upload",
+                                 queue_id: str = None, on_segment=None):
+        """
+        Transcribe a decoded 16kHz array through the fair scheduler at the given priority
+        
+        Jobs sharing a queue_id (e.g. the windows of one long upload) share one round-robin
+        slot, so one recording cannot crowd out others of the same priority. on_segment is
+        called from a processing thread with each segment dict as it decodes.
+        """
+        job = ChunkJob(queue_id or f"{priority}_{uuid.uuid4().hex}", 0, label, profile=profile, priority=priority)
+        job.set_audio(audio)
+        job.on_segment = on_segment
+        return await asyncio.wrap_future(self.submit(job))
+    
+    def has_idle_worker(self):
+        """Whether a job submitted now would start at once instead of waiting in the queue"""
+        with self.queue_lock:
+            return not self.processing_queue and self.busy_workers < self.target_workers
+    
+    def _fail_submitted_job(self, job, error: Exception):
+        """Resolve a submitted job's future with an error; False for session chunks"""
+        if job.future is None:
+            return False
+        job.release_audio(recycle=False)
+        self._settle_future(job.future, error=error)
+        return True
+    
+    @staticmethod
+    def _settle_future(future, result=None, error: Exception = None):
+        """Resolve a submitted job's future unless its caller already cancelled it"""
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            # Cancelled between the worker taking the job and finishing it - nobody is waiting
+            pass
+    
+    def _chunk_settled(self, session_id: str):
+        """A session chunk finished, successfully or not"""
+        with self.session_lock:
+            if session_id in self.sessions:
+                self.sessions[session_id]['in_flight_chunks'] = max(0, self.sessions[session_id]['in_flight_chunks'] - 1)
+    
+    async def wait_for_session_chunks(self, session_id: str, timeout: float = SESSION_END_WAIT_SECONDS):
+        """Wait until every chunk queued for a session has been transcribed; False if the timeout ran out first"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.session_lock:
+                session_info = self.sessions.get(session_id)
+                in_flight = session_info['in_flight_chunks'] if session_info is not None else 0
+            if not in_flight:
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning(f"[PROCESSOR] Session {session_id} still has {in_flight} chunk(s) in flight after {timeout}s")
+                return False
+            await asyncio.sleep(0.05)
     
     def mark_session_complete(self, session_id: str):
         """Mark a session as complete"""
@@ -2008,34 +4354,92 @@ class AudioProcessor:
                 logger.warning(f"[PROCESSOR] Cannot update username - session {session_id} not found")
                 return False
     
-    def _process_loop(self):
-        """Main processing loop that processes queued audio chunks"""
-        while self.running:
+    def _process_loop(self, worker_index: int = 0):
+        """Main processing loop - blocks on the queue and drains it as chunks arrive, until stopped or retired"""
+        while self.running and worker_index < self.target_workers:
             try:
-                self._process_queue()
-                self._cleanup_completed_sessions()
-                time.sleep(1.0)  # Check every 1 second to reduce race conditions
+                self._process_queue(worker_index)
             except Exception as e:
                 logger.error(f"Error in audio processing loop: {str(e)}")
                 time.sleep(5)  # Wait longer on error
     
-    def _process_queue(self):
-        """Process audio chunks from the queue with concurrency control"""
-        with self.queue_lock:
-            if not self.processing_queue:
-                return
+    def _housekeeping_loop(self):
+        """Run session cleanup on its own timer, independent of chunk processing"""
+        while not self.stop_event.wait(self.session_cleanup_interval):
+            try:
+                self._cleanup_completed_sessions()
+                work_journal.prune(WORK_JOURNAL_REPLAY_MAX_AGE_HOURS)
+            except Exception as e:
+                logger.error(f"Error in session housekeeping: {str(e)}")
+    
+    def _pop_chunk(self):
+        """Pop the oldest queued chunk and record how long it waited (queue lock must be held)"""
+        job = self.processing_queue.pop()
+        if self.spilled:
+            self._readmit_spilled()
+        self.last_queue_wait_ms = job.queue_wait_ms
+        self.max_queue_wait_ms = max(self.max_queue_wait_ms, job.queue_wait_ms)
+        self.autoscaler.record_wait(job.queue_wait_ms)
+        return job
+    
+    def _take_batch(self, worker_index: int = 0):
+        """Block until a chunk is queued; under backlog also take up to BATCH_MAX_SIZE-1 more arriving within BATCH_MAX_WAIT_MS"""
+        with self.queue_condition:
+            while self.running and worker_index < self.target_workers and not self.processing_queue:
+                self.queue_condition.wait(timeout=1.0)
+            if not self.processing_queue or (self.running and worker_index >= self.target_workers):
+                return []
             
             # Get next chunk to process
-            chunk_info = self.processing_queue.pop(0)
+            batch = [self._pop_chunk()]
+            self.busy_workers += 1
+            
+            # A lone chunk on an idle queue goes straight to decode; batching only kicks in under backlog,
+            # and only for jobs the batched decode can honour - the rest stay queued for other workers
+            if BATCH_MAX_SIZE <= 1 or not self.processing_queue or not self._batchable(batch[0]):
+                logger.info(f"[PROCESSOR] Took 1 chunk from queue - wait: {batch[0].queue_wait_ms:.1f} ms")
+                return batch
+            
+            deadline = time.monotonic() + BATCH_MAX_WAIT_MS / 1000.0
+            while len(batch) < BATCH_MAX_SIZE:
+                while self.processing_queue and len(batch) < BATCH_MAX_SIZE and self._batchable(self.processing_queue.peek()):
+                    batch.append(self._pop_chunk())
+                if self.processing_queue and not self._batchable(self.processing_queue.peek()):
+                    break
+                remaining = deadline - time.monotonic()
+                if len(batch) >= BATCH_MAX_SIZE or remaining <= 0 or not self.running:
+                    break
+                self.queue_condition.wait(timeout=remaining)
+        
+        logger.info(f"[PROCESSOR] Took {len(batch)} chunk(s) from queue - wait: {batch[0].queue_wait_ms:.1f} ms")
+        return batch
+    
+    def _batchable(self, job):
+        """Whether a job may share a batched decode with others"""
+        return job.on_segment is None and job.profile in BATCHABLE_PROFILES
+    
+    def _mark_chunk_processed(self, session_id: str, filepath: str, chunk_number: int = None):
+        """Record a chunk as processed and advance its session's progress"""
+        self.processed_files.add(filepath)
+        if chunk_number is not None:
+            work_journal.chunk_done(session_id, chunk_number)
+        
+        # Update session processed count
+        with self.session_lock:
+            if session_id in self.sessions:
+                self.sessions[session_id]['processed_chunks'] += 1
+                processed = self.sessions[session_id]['processed_chunks']
+                total = self.sessions[session_id]['total_chunks']
+                logger.info(f"[PROCESSOR] Session {session_id} progress: {processed}/{total} chunks processed")
         
-        # Use semaphore to limit concurrent processing
-        with self.processing_semaphore:
-            session_id = chunk_info['session_id']
-            username = chunk_info.get('username', 'unknown')
-            session_count = chunk_info.get('session_count', 1)
-            filepath = chunk_info['filepath']
-            chunk_number = chunk_info['chunk_number']
-            icu_data = chunk_info.get('icu_data', {})
+        self._chunk_settled(session_id)
+        self._update_flow_control(session_id)
+    
+    def _resolve_chunk_file(self, job):
+        """Find the chunk's audio file, following a session directory move if needed"""
+        session_id = job.session_id
+        filepath = job.filepath
+        chunk_number = job.chunk_number
         
         # Check if file still exists before processing
         if not os.path.exists(filepath):
@@ -2060,103 +4464,285 @@ class AudioProcessor:
             # If we still can't find the file, mark as processed and skip
             if not os.path.exists(filepath):
                 # Mark as processed to avoid retry loops
-                file_key = f"{session_id}_{os.path.basename(filepath)}"
-                self.processed_files.add(filepath)
-                
-                # Update session processed count
-                with self.session_lock:
-                    if session_id in self.sessions:
-                        self.sessions[session_id]['processed_chunks'] += 1
-                        processed = self.sessions[session_id]['processed_chunks']
-                        total = self.sessions[session_id]['total_chunks']
-                        logger.info(f"[PROCESSOR] Session {session_id} progress: {processed}/{total} chunks processed")
-                return
+                self._mark_chunk_processed(session_id, filepath, chunk_number)
+                return None
         
+        return os.path.abspath(filepath)
+    
+    def _process_queue(self, worker_index: int = 0):
+        """Process the next chunk, or a batch of chunks from several sessions, from the queue"""
+        batch = self._take_batch(worker_index)
+        if not batch:
+            return
         try:
+            self._process_batch(batch)
+        finally:
+            with self.queue_lock:
+                self.busy_workers -= 1
+    
+    def _process_batch(self, batch):
+        """Decode, gate, transcribe and finalize a batch taken from the queue"""
+        prepared = []
+        for job in batch:
+            if job.future is not None and job.future.cancelled():
+                # The caller gave up waiting (e.g. a stale streaming partial) - don't spend a decode on it
+                job.release_audio(recycle=False)
+                continue
+            session_id = job.session_id
+            chunk_number = job.chunk_number
+            icu_context = job.icu_context
+            
+            if job.audio is not None:
+                # Submitted already decoded - there is no file behind it
+                pass
+            elif job.audio_bytes is not None:
+                # Handed over in memory - the durable copy may still be in the writer queue
+                job.filepath = os.path.abspath(job.filepath)
+            else:
+                filepath = self._resolve_chunk_file(job)
+                if filepath is None:
+                    self._fail_submitted_job(job, FileNotFoundError(job.filepath))
+                    continue
+                job.filepath = filepath
+            
             # Log ICU context for this chunk
-            patient_name = icu_data.get('patient', {}).get('name', 'Unknown') if icu_data.get('patient') else 'Unknown'
-            ward_name = icu_data.get('ward', {}).get('desc', 'Unknown') if icu_data.get('ward') else 'Unknown'
-            user_name = icu_data.get('user', {}).get('loginname', 'Unknown') if icu_data.get('user') else 'Unknown'
+            patient_name = icu_context['patient'].get('name', 'Unknown') if icu_context['patient'] else 'Unknown'
+            ward_name = icu_context['ward'].get('desc', 'Unknown') if icu_context['ward'] else 'Unknown'
+            user_name = icu_context['user'].get('loginname', 'Unknown') if icu_context['user'] else 'Unknown'
             
             logger.info(f"[PROCESSOR] Processing chunk {chunk_number} for session {session_id} - Patient: {patient_name}, Ward: {ward_name}, User: {user_name}")
-            logger.info(f"[PROCESSOR] File: {filepath}")
-
+            logger.info(f"[PROCESSOR] File: {job.filepath}")
             
-            filepath = os.path.abspath(filepath)
-
-            with open(filepath, "rb") as f:
-               audio_bytes = f.read()
-
-            # Process with Whisper model
-            result = transcribe_audio_bytes(audio_bytes)
-            transcription_text = result["text"].strip()
+            try:
+                # Stored chunks are memory-mapped rather than read into a bytes copy
+                if job.audio is not None:
+                    pass
+                elif job.audio_bytes is not None:
+                    job.set_audio(decode_audio_bytes(job.audio_bytes, audio_buffer_pool))
+                else:
+                    job.set_audio(read_chunk_audio(job.filepath, audio_buffer_pool))
+            except FileNotFoundError as e:
+                logger.exception(f"[PROCESSOR] File not found during processing {job.filepath}: {str(e)}")
+                if self._fail_submitted_job(job, e):
+                    continue
+                # Mark as processed to avoid retry loops
+                self._mark_chunk_processed(session_id, job.filepath, chunk_number)
+                continue
+            except Exception as e:
+                logger.error(f"[PROCESSOR] Error decoding {job.filepath}: {str(e)}")
+                self._finalize_chunk(job, {"text": "", "language": "en", "language_probability": 0.0, "error": str(e)})
+                continue
+            
+            if ENABLE_VAD_PREGATE and self._is_silent_chunk(job):
+                # Pure silence never reaches the model, but still counts as processed
+                self._finalize_chunk(job, {
+                    "text": "",
+                    "language": "en",
+                    "language_probability": 0.0,
+                    "vad_skipped": True
+                })
+                continue
             
-            # Process with Whisper model
-            # result = model.transcribe(filepath)
-            # transcription_text = result["text"].strip()
+            prepared.append(job)
+        
+        if not prepared:
+            return
+        
+        for job in prepared:
+            if job.draft and draft_transcriber.active:
+                draft_transcriber.submit(job.audio, lambda result, job=job: self._deliver_draft(job, result))
+        
+        # Under load, decode below the requested quality rather than let latency balloon
+        load_level = self.load_controller.update(self.queue_depth())
+        
+        # Chunks only share a batched call with chunks using the same decode profile and model
+        profile_groups = defaultdict(list)
+        for job in prepared:
+            model = self.load_controller.degrade(job, load_level)
+            # Jobs streaming their segments to a caller, or whose profile needs word timing, are decoded on their own
+            profile_groups[(job.profile, model, None if self._batchable(job) else id(job))].append(job)
+        for (profile, model, _), jobs in profile_groups.items():
+            self._transcribe_jobs(jobs, profile, model)
+    
+    def queue_depth(self):
+        """Chunks waiting in the scheduler or spilled to disk"""
+        with self.queue_lock:
+            return len(self.processing_queue) + sum(len(spilled) for spilled in self.spilled.values())
+    
+    def _transcribe_jobs(self, jobs, profile, model=None):
+        """Run inference for decoded jobs sharing a decode profile and finalize each one
+        
+        model is None for the main model, or the draft model's name when the load controller
+        has stepped down to it.
+        """
+        started = time.monotonic()
+        # A hung call is abandoned at the timeout, so it has to cover the whole audio, not a flat 300s
+        timeout = inference_executor.timeout_for(sum(job.duration for job in jobs))
+        try:
+            # Process with Whisper model - one batched call when several chunks were waiting
+            if model is not None:
+                results = [draft_transcriber.transcribe_sync(job.audio, profile) for job in jobs]
+            elif len(jobs) == 1 and jobs[0].on_segment is not None:
+                results = [inference_executor.transcribe_streaming_sync(jobs[0].audio, jobs[0].on_segment, timeout=timeout, profile=profile)]
+            elif len(jobs) == 1 and self._wants_segment_partials(jobs[0]):
+                results = [inference_executor.transcribe_streaming_sync(jobs[0].audio, self._make_segment_partial_callback(jobs[0]), timeout=timeout, profile=profile)]
+            elif len(jobs) == 1:
+                results = [inference_executor.transcribe_decoded_sync(jobs[0].audio, timeout=timeout, profile=profile)]
+            else:
+                logger.info(f"[PROCESSOR] Decoding batch of {len(jobs)} chunks from {len({job.session_id for job in jobs})} sessions (profile: {profile})")
+                results = inference_executor.transcribe_batch_sync([job.audio for job in jobs], timeout=timeout, profile=profile)
+        except Exception as e:
+            for job in jobs:
+                logger.exception(f"[PROCESSOR] Error processing {job.filepath}: {str(e)}")
+                if self._fail_submitted_job(job, e):
+                    continue
+                # Mark as processed to avoid retry loops
+                self.processed_files.add(job.filepath)
+                work_journal.chunk_done(job.session_id, job.chunk_number)
+                self._chunk_settled(job.session_id)
+                job.release_audio(recycle=False)
+            return
+        finally:
+            if model is not None:
+                draft_transcriber.release_finals(len(jobs))
+        if model is None:
+            self.load_controller.record_decode(time.monotonic() - started, sum(job.duration for job in jobs))
+        
+        for job, result in zip(jobs, results):
+            self._finalize_chunk(job, result)
+    
+    def _wants_segment_partials(self, job):
+        """Segments only arrive ahead of the final for multi-window chunks or a cheap first pass"""
+        return ENABLE_SEGMENT_PARTIALS and job.future is None and (job.duration > BATCH_MAX_CHUNK_SECONDS or job.profile in TWO_PASS_PROFILES)
+    
+    def _make_segment_partial_callback(self, job):
+        """Build the on_segment callback that forwards a chunk's decoded segments as partial messages"""
+        texts = []
+        
+        def on_segment(segment):
+            if segment is None:
+                texts.clear()  # A second pass starts over
+                return
+            if segment["text"]:
+                texts.append(segment["text"])
+            self.push_message(job.session_id, {
+                "type": "partial",
+                "chunk_id": job.chunk_number,
+                "segment": segment,
+                "text": " ".join(texts),  # Everything decoded so far; the final "transcription" replaces it
+                "timestamp": int(datetime.now().timestamp() * 1000)
+            })
+        return on_segment
+    
+    def _is_silent_chunk(self, job):
+        """Score a chunk with the VAD pre-gate, record the score on its session and decide whether to skip it"""
+        session_id = job.session_id
+        score = score_chunk_speech(job.audio)
+        skipped = score['speech_ms'] < VAD_PREGATE_MIN_SPEECH_MS
+        
+        with self.session_lock:
+            if session_id in self.sessions:
+                vad_stats = self.sessions[session_id]['vad_stats']
+                vad_stats['scored_chunks'] += 1
+                vad_stats['skipped_chunks'] += int(skipped)
+                vad_stats['audio_seconds'] += score['audio_seconds']
+                vad_stats['speech_seconds'] += score['speech_ms'] / 1000
+                vad_stats['chunks'].append({"chunk": job.chunk_number, "skipped": skipped, **score})
+        
+        if skipped:
+            logger.info(f"[PROCESSOR] VAD pre-gate skipped chunk {job.chunk_number} for session {session_id} - Speech: {score['speech_ms']}ms, Peak RMS: {score['peak_rms']}")
+        return skipped
+    
+    def _deliver_draft(self, job, result):
+        """Push a draft transcription unless the chunk's final result got there first"""
+        text = result["text"].strip()
+        if not text:
+            return
+        with self.draft_lock:
+            # Pushing under the lock keeps a draft from landing behind its own final
+            if job.final_delivered:
+                return
+            job.draft_delivered = self.push_message(job.session_id, {
+                "type": "transcription",
+                "draft": True,
+                "chunk_id": job.chunk_number,
+                "text": text,
+                "confidence": result.get("confidence", 0.0),
+                "language": result.get("language", "en"),
+                "timestamp": int(datetime.now().timestamp() * 1000),
+                "icu_context": job.icu_context
+            })
+    
+    def is_draft_superseded(self, session_id: str, chunk_number: int):
+        """Whether a chunk's final result has already been queued, making its draft stale"""
+        with self.session_lock:
+            session_info = self.sessions.get(session_id)
+            return session_info is not None and chunk_number in session_info['finalized_drafts']
+    
+    def _finalize_chunk(self, job, result):
+        """Fan a transcription result back out to the session's outputs and websocket"""
+        session_id = job.session_id
+        chunk_number = job.chunk_number
+        with self.draft_lock:
+            job.final_delivered = True
+        if job.draft_delivered:
+            with self.session_lock:
+                if session_id in self.sessions:
+                    self.sessions[session_id]['finalized_drafts'].add(chunk_number)
+        # Inference is done with the PCM; only the job's metadata is needed from here on
+        job.release_audio()
+        result["queue_wait_ms"] = round(job.queue_wait_ms, 1)
+        if job.degraded is not None:
+            result["degraded"] = job.degraded
+        
+        if job.future is not None:
+            # Submitted (reprocessing/upload) jobs hand the result back instead of to a session
+            self._settle_future(job.future, result)
+            return
+        
+        try:
+            transcription_text = result["text"].strip()
             
             if transcription_text:  # Only process if there's actual text
                 # Create output data with ICU context
                 output_data = {
                     "session_id": session_id,
                     "chunk": chunk_number,
-                    "filename": filepath,
+                    "filename": job.filepath,
                     "text": transcription_text,
                     "confidence": result.get("confidence", 0.0),
                     "language": result.get("language", "en"),
                     "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "segments": result.get("segments", []),  # Include segments for word-level timing
-                    "icu_context": {
-                        "patient": icu_data.get('patient'),
-                        "ward": icu_data.get('ward'),
-                        "user": icu_data.get('user'),
-                        "assessment": icu_data.get('assessment'),
-                        "username": icu_data.get('username', username)
-                    }
+                    "audio_duration": job.duration,
+                    "sample_rate": job.sample_rate,
+                    "content_hash": job.content_hash,
+                    "degraded": job.degraded,
+                    "icu_context": job.icu_context
                 }
                 
                 # Save transcription to file
-                self._save_transcription_output(session_id, chunk_number, output_data, username, session_count)
+                self._save_transcription_output(session_id, chunk_number, output_data, job.username, job.session_count)
                 
                 # Send message directly to websocket with ICU context
-                self._send_websocket_message_immediate(session_id, chunk_number, transcription_text, result, icu_data)
+                self._send_websocket_message_immediate(session_id, chunk_number, transcription_text, result, job.icu_context)
                 
                 logger.info(f"[PROCESSOR] Chunk {chunk_number} processed - Text: '{transcription_text}'")
             else:
                 logger.info(f"[PROCESSOR] No transcription text for chunk {chunk_number} (likely silence)")
+                if job.draft_delivered:
+                    # Retract the draft - the final decode found no speech
+                    self._send_websocket_message_immediate(session_id, chunk_number, "", result, job.icu_context)
             
             # Mark as processed and update session info
-            file_key = f"{session_id}_{os.path.basename(filepath)}"
-            self.processed_files.add(filepath)
-            
-            # Update session processed count
-            with self.session_lock:
-                if session_id in self.sessions:
-                    self.sessions[session_id]['processed_chunks'] += 1
-                    processed = self.sessions[session_id]['processed_chunks']
-                    total = self.sessions[session_id]['total_chunks']
-                    logger.info(f"[PROCESSOR] Session {session_id} progress: {processed}/{total} chunks processed")
-            
-        except FileNotFoundError as e:
-            logger.exception(f"[PROCESSOR] File not found during processing {filepath}: {str(e)}")
-            # Mark as processed to avoid retry loops
-            file_key = f"{session_id}_{os.path.basename(filepath)}"
-            self.processed_files.add(filepath)
+            self._mark_chunk_processed(session_id, job.filepath, chunk_number)
             
-            # Update session processed count
-            with self.session_lock:
-                if session_id in self.sessions:
-                    self.sessions[session_id]['processed_chunks'] += 1
-                    processed = self.sessions[session_id]['processed_chunks']
-                    total = self.sessions[session_id]['total_chunks']
-                    logger.info(f"[PROCESSOR] Session {session_id} progress: {processed}/{total} chunks processed")
         except Exception as e:
-            logger.exception(f"[PROCESSOR] Error processing {filepath}: {str(e)}")
+            logger.exception(f"[PROCESSOR] Error processing {job.filepath}: {str(e)}")
             # Mark as processed to avoid retry loops
-            file_key = f"{session_id}_{os.path.basename(filepath)}"
-            self.processed_files.add(filepath)
-    
-
+            self.processed_files.add(job.filepath)
+            work_journal.chunk_done(session_id, chunk_number)
+            self._chunk_settled(session_id)
     
     def _save_transcription_output(self, session_id, chunk_number, output_data, username=None, session_count=None):
         """Save transcription output to audio_files folder"""
@@ -2175,6 +4761,10 @@ class AudioProcessor:
                 # Convert segments to serializable format
                 serializable_segments = []
                 for segment in json_data['segments']:
+                    if isinstance(segment, dict):
+                        # Batched results already carry plain dict segments
+                        serializable_segments.append(segment)
+                        continue
                     segment_dict = {
                         'start': segment.start,
                         'end': segment.end,
@@ -2282,9 +4872,9 @@ class AudioProcessor:
             logger.info(f"[DEBUG] Patient info: {patient_info}")
             logger.info(f"[DEBUG] Assessment info: {assessment_info}")
             
-            # Get real audio duration from the audio file
+            # Get real audio duration - from the decode when known, otherwise from the audio file
             audio_filepath = output_data.get('filename', '')
-            audio_duration = self._get_audio_duration(audio_filepath)
+            audio_duration = output_data.get('audio_duration') or self._get_audio_duration(audio_filepath)
             
             # Create word objects from Whisper segments (if available)
             transcription_text = output_data.get('text', '')
@@ -2306,7 +4896,8 @@ class AudioProcessor:
             audio_filepath = output_data.get('filename', '')
             baseurl = "http://192.168.1.21:8111/voices"
             
-            if audio_filepath and os.path.exists(audio_filepath):
+            # The durable copy may still be in the writer queue, so don't require it to exist yet
+            if audio_filepath:
                 # Convert absolute path to relative path from audio directory
                 audio_dir = os.path.abspath("audio")
                 if audio_filepath.startswith(audio_dir):
@@ -2573,8 +5164,10 @@ class AudioProcessor:
                 logger.warning(f"[BACKGROUND] Audio file not found: {audio_filepath}, using default duration")
                 return 5.0  # Default fallback
             
-            # Use librosa to get audio duration
-            duration = librosa.get_duration(path=audio_filepath)
+            # WAV chunks carry their duration in the header; only other formats need librosa
+            duration = read_wav_duration(audio_filepath) if audio_filepath.lower().endswith(".wav") else None
+            if duration is None:
+                duration = librosa.get_duration(path=audio_filepath)
             logger.info(f"[BACKGROUND] Audio duration: {duration:.2f} seconds for {os.path.basename(audio_filepath)}")
             return duration
             
@@ -2582,56 +5175,54 @@ class AudioProcessor:
             logger.error(f"[BACKGROUND] Error getting audio duration: {str(e)}, using default duration")
             return 5.0  # Default fallback
     
-    def _send_websocket_message_immediate(self, session_id: str, chunk_number: int, transcription_text: str, result, icu_data: dict = None):
-        """Send transcription result to websocket immediately with ICU context"""
+    def push_message(self, session_id: str, message: dict):
+        """Hand a message to the session's outbox from any thread; the sender task pushes it immediately"""
         with self.session_lock:
             if session_id not in self.sessions:
                 logger.warning(f"[PROCESSOR] Session {session_id} not found in sessions")
-                return
+                return False
             
             session_info = self.sessions[session_id]
             if not session_info['websocket_active']:
                 logger.info(f"[PROCESSOR] Websocket not active for session {session_id}, skipping send")
-                return
+                return False
             
-            websocket = session_info['websocket']
+            loop = session_info.get('loop')
+            outbox = session_info.get('outbox')
+            if loop is None or outbox is None:
+                logger.warning(f"[PROCESSOR] Session {session_id} has no outbox, skipping send")
+                return False
             
             try:
-                transcription_message = {
-                    "type": "transcription",
-                    "chunk_id": chunk_number,
-                    "text": transcription_text,
-                    "confidence": result.get("confidence", 0.0),
-                    "language": result.get("language", "en"),
-                    "timestamp": int(datetime.now().timestamp() * 1000),  # Unix timestamp in milliseconds
-                    "icu_context": {
-                        "patient": icu_data.get('patient') if icu_data else None,
-                        "ward": icu_data.get('ward') if icu_data else None,
-                        "user": icu_data.get('user') if icu_data else None,
-                        "username": icu_data.get('username') if icu_data else None
-                    }
-                }
-                
-                # Store the message to be sent by the main WebSocket handler
-                if 'pending_messages' not in session_info:
-                    session_info['pending_messages'] = []
-                session_info['pending_messages'].append(transcription_message)
-                
-                logger.info(f"[PROCESSOR] Message queued for session {session_id}, chunk {chunk_number}")
-                    
-            except Exception as e:
+                loop.call_soon_threadsafe(outbox.put_nowait, message)
+                return True
+            except RuntimeError as e:
+                # Event loop already closed
                 logger.warning(f"[PROCESSOR] Failed to queue message for session {session_id}: {str(e)}")
-                # Mark websocket as inactive
                 session_info['websocket_active'] = False
+                return False
+    
+    def _send_websocket_message_immediate(self, session_id: str, chunk_number: int, transcription_text: str, result, icu_context: dict = None):
+        """Send transcription result to websocket immediately with ICU context"""
+        transcription_message = {
+            "type": "transcription",
+            "draft": False,  # Final result - replaces any draft pushed for this chunk_id
+            "chunk_id": chunk_number,
+            "text": transcription_text,
+            "confidence": result.get("confidence", 0.0),
+            "language": result.get("language", "en"),
+            "queue_wait_ms": result.get("queue_wait_ms"),
+            "degraded": result.get("degraded"),  # Set when decoded below the requested quality under load
+            "timestamp": int(datetime.now().timestamp() * 1000),  # Unix timestamp in milliseconds
+            "icu_context": icu_context  # The job's context dict, shared rather than rebuilt
+        }
+        
+        if self.push_message(session_id, transcription_message):
+            logger.info(f"[PROCESSOR] Message pushed for session {session_id}, chunk {chunk_number}")
     
     def _cleanup_completed_sessions(self):
         """Clean up sessions that are complete and all chunks processed"""
         current_time = time.time()
-        
-        # Only run cleanup periodically to avoid performance impact
-        if current_time - self.last_cleanup < self.session_cleanup_interval:
-            return
-        
         self.last_cleanup = current_time
         
         with self.session_lock:
@@ -2649,7 +5240,7 @@ class AudioProcessor:
                     # Check if all chunks for this session have been processed
                     session_dir = session_info['dir']
                     if os.path.exists(session_dir):
-                        audio_files = glob.glob(os.path.join(session_dir, "chunk_*.wav"))
+                        audio_files = glob_chunk_files(session_dir)
                         all_processed = True
                         
                         for audio_file in audio_files:
@@ -2687,7 +5278,7 @@ class AudioProcessor:
             
             # Double-check that all files are processed before cleanup
             if os.path.exists(session_dir):
-                audio_files = glob.glob(os.path.join(session_dir, "chunk_*.wav"))
+                audio_files = glob_chunk_files(session_dir)
                 unprocessed_files = []
                 
                 for audio_file in audio_files:
@@ -3045,17 +5636,274 @@ class ICUCareLiteClient:
             logger.error(f"ICU Care Lite traceback: {traceback.format_exc()}")
             return None
 
+class WorkJournal:
+    """
+    Durable record of queued session chunks and background uploads (SQLite in WAL mode)
+    
+    Each chunk is recorded when queued and marked done once its transcription is saved,
+    so whatever was queued or in flight when the server stopped or crashed is replayed
+    from its stored chunk file on the next start. Journal errors are logged, never raised:
+    transcription carries on without durability rather than failing.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = None
+        self.lock = threading.Lock()
+    
+    def open(self):
+        """Open (or create) the journal database"""
+        try:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")  # Commits survive a process crash; chunk audio is fsynced separately
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    session_id TEXT NOT NULL,
+                    chunk_number INTEGER NOT NULL,
+                    filepath TEXT NOT NULL,
+                    username TEXT,
+                    session_count INTEGER,
+                    icu_context TEXT,
+                    profile TEXT,
+                    priority TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    enqueued_at REAL NOT NULL,
+                    completed_at REAL,
+                    PRIMARY KEY (session_id, chunk_number)
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    filename TEXT,
+                    spool_path TEXT,
+                    language TEXT,
+                    task_type TEXT,
+                    profile TEXT,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    completed_at REAL
+                )""")
+            logger.info(f"[JOURNAL] Work journal opened at {self.path}")
+        except Exception as e:
+            logger.error(f"[JOURNAL] Could not open work journal {self.path}, queued work will not survive a restart: {str(e)}")
+            self.conn = None
+    
+    def _execute(self, sql: str, params=()):
+        """Run one statement; returns the fetched rows, or None if the journal is unavailable"""
+        if self.conn is None:
+            return None
+        try:
+            with self.lock:
+                return self.conn.execute(sql, params).fetchall()
+        except Exception as e:
+            logger.error(f"[JOURNAL] {str(e)}")
+            return None
+    
+    def _claim(self, select_sql: str, update_sql: str, params=()):
+        """Select unfinished rows and bump their attempt counter in one transaction"""
+        if self.conn is None:
+            return []
+        try:
+            with self.lock:
+                self.conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = self.conn.execute(select_sql, params).fetchall()
+                    self.conn.execute(update_sql, params)
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    raise
+            return rows
+        except Exception as e:
+            logger.error(f"[JOURNAL] {str(e)}")
+            return []
+    
+    def chunk_enqueued(self, job):
+        """Record a session chunk as queued"""
+        self._execute(
+            "INSERT INTO chunks (session_id, chunk_number, filepath, username, session_count, icu_context, profile, priority, enqueued_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (session_id, chunk_number) DO UPDATE SET filepath = excluded.filepath, completed_at = NULL",
+            (job.session_id, job.chunk_number, os.path.abspath(job.filepath), job.username, job.session_count,
+             json.dumps(job.icu_context, default=str), job.profile, job.priority, time.time())
+        )
+    
+    def chunk_done(self, session_id: str, chunk_number: int):
+        """Record a session chunk as finished (transcribed, silent or given up on)"""
+        self._execute(
+            "UPDATE chunks SET completed_at = ? WHERE session_id = ? AND chunk_number = ? AND completed_at IS NULL",
+            (time.time(), session_id, chunk_number)
+        )
+    
+    def pending_chunks(self, max_age_hours: float):
+        """Unfinished chunks to replay, oldest first; each call counts as one replay attempt"""
+        cutoff = time.time() - max_age_hours * 3600
+        rows = self._claim(
+            "SELECT session_id, chunk_number, filepath, username, session_count, icu_context, profile, priority, attempts + 1 "
+            "FROM chunks WHERE completed_at IS NULL AND enqueued_at >= ? ORDER BY enqueued_at, chunk_number",
+            "UPDATE chunks SET attempts = attempts + 1 WHERE completed_at IS NULL AND enqueued_at >= ?",
+            (cutoff,)
+        )
+        return [dict(zip(("session_id", "chunk_number", "filepath", "username", "session_count", "icu_context",
+                          "profile", "priority", "attempts"), row)) for row in rows]
+    
+    def task_started(self, task_id: str, filename: str, spool_path: str, language: str, task_type: str, profile: str):
+        """Record a background upload whose audio has been spooled to disk"""
+        self._execute(
+            "INSERT OR REPLACE INTO tasks (task_id, filename, spool_path, language, task_type, profile, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'processing', ?)",
+            (task_id, filename, spool_path, language, task_type, profile, time.time())
+        )
+    
+    def task_finished(self, task_id: str, status: str, result: dict = None, error: str = None):
+        """Record a background upload as completed or failed, keeping its result for /task-status"""
+        if result is not None and result.get("segments"):
+            # Segment objects become the same plain dicts long-audio results already carry
+            result = dict(result, segments=[_offset_segment(segment, 0.0) for segment in result["segments"]])
+        self._execute(
+            "UPDATE tasks SET status = ?, result = ?, error = ?, completed_at = ? WHERE task_id = ?",
+            (status, json.dumps(result, default=str) if result is not None else None, error, time.time(), task_id)
+        )
+    
+    def pending_tasks(self, max_age_hours: float):
+        """Background uploads that were still processing, to restart; each call counts as one attempt"""
+        cutoff = time.time() - max_age_hours * 3600
+        rows = self._claim(
+            "SELECT task_id, filename, spool_path, language, task_type, profile, attempts + 1 "
+            "FROM tasks WHERE status = 'processing' AND created_at >= ? ORDER BY created_at",
+            "UPDATE tasks SET attempts = attempts + 1 WHERE status = 'processing' AND created_at >= ?",
+            (cutoff,)
+        )
+        return [dict(zip(("task_id", "filename", "spool_path", "language", "task_type", "profile", "attempts"), row)) for row in rows]
+    
+    def get_task(self, task_id: str):
+        """A background task's final state from the journal (for tasks from before a restart)"""
+        rows = self._execute(
+            "SELECT status, filename, result, error, completed_at FROM tasks WHERE task_id = ?", (task_id,)
+        )
+        if not rows:
+            return None
+        status, filename, result, error, completed_at = rows[0]
+        return {
+            "status": status,
+            "filename": filename,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "finished_at": datetime.fromtimestamp(completed_at).isoformat() if completed_at else None
+        }
+    
+    def prune(self, max_age_hours: float):
+        """Forget finished work older than max_age_hours"""
+        cutoff = time.time() - max_age_hours * 3600
+        self._execute("DELETE FROM chunks WHERE completed_at IS NOT NULL AND completed_at < ?", (cutoff,))
+        self._execute("DELETE FROM tasks WHERE completed_at IS NOT NULL AND completed_at < ?", (cutoff,))
+    
+    def stats(self):
+        """Unfinished and finished counts for /server-status"""
+        chunk_rows = self._execute("SELECT completed_at IS NULL, COUNT(*) FROM chunks GROUP BY completed_at IS NULL")
+        task_rows = self._execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+        if chunk_rows is None or task_rows is None:
+            return {"enabled": False}
+        chunks = {bool(pending): count for pending, count in chunk_rows}
+        return {
+            "enabled": True,
+            "path": self.path,
+            "pending_chunks": chunks.get(True, 0),
+            "finished_chunks": chunks.get(False, 0),
+            "tasks": dict(task_rows)
+        }
+    
+    def close(self):
+        """Checkpoint the WAL into the database file and close it"""
+        if self.conn is None:
+            return
+        try:
+            with self.lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.conn.close()
+                self.conn = None
+            logger.info("[JOURNAL] Work journal checkpointed and closed")
+        except Exception as e:
+            logger.error(f"[JOURNAL] Error closing work journal: {str(e)}")
+
 # Configuration
 ENABLE_AUTO_CLEANUP = False  # Set to False to disable automatic cleanup for debugging
 
-# Initialize audio processor
-audio_processor = AudioProcessor()
+# Initialize chunk writer, work journal and audio processor
+chunk_writer = ChunkWriter()
+work_journal = WorkJournal(WORK_JOURNAL_PATH)
+draft_transcriber = DraftTranscriber(
+    enabled=ENABLE_DRAFT_CASCADE,
+    model_name=DRAFT_MODEL_NAME,
+    cpu_threads=DRAFT_CPU_THREADS,
+    profile=DRAFT_DECODE_PROFILE,
+    max_pending=DRAFT_MAX_PENDING,
+    final_slots=DRAFT_FINAL_SLOTS
+)
+audio_processor = AudioProcessor(num_workers=inference_executor.concurrency)
 
 # Background task storage for long audio processing
 background_tasks = {}
 task_lock = threading.Lock()
 
-async def process_audio_background(task_id: str, audio_bytes: bytes, filename: str, language: str, task_type: str):
+def spool_background_upload(task_id: str, filename: str, audio_bytes: bytes):
+    """Write a background upload to the spool directory so it survives a restart; returns the path or None"""
+    try:
+        os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+        spool_path = safe_path_join(UPLOAD_SPOOL_DIR, f"{task_id}_{filename or 'upload'}")
+        with open(spool_path, 'wb') as spool_file:
+            spool_file.write(audio_bytes)
+            spool_file.flush()             # Force flush buffers
+            os.fsync(spool_file.fileno())  # Force flush to disk at OS level
+        return spool_path
+    except Exception as e:
+        logger.error(f"Background task {task_id}: Could not spool upload, it will not survive a restart: {str(e)}")
+        return None
+
+def _remove_spooled_upload(spool_path: str):
+    """Delete a finished task's spooled audio"""
+    if spool_path:
+        try:
+            os.remove(spool_path)
+        except OSError:
+            pass
+
+# Strong references to resumed task coroutines - the event loop only keeps weak ones
+resumed_background_tasks = set()
+
+async def _resume_background_task(task: dict):
+    """Re-run a journaled background upload from its spooled audio"""
+    def read_spool():
+        with open(task["spool_path"], 'rb') as spool_file:
+            return spool_file.read()
+    
+    try:
+        audio_bytes = await asyncio.to_thread(read_spool)
+    except Exception as e:
+        logger.error(f"Background task {task['task_id']}: Cannot resume, spooled audio unreadable: {str(e)}")
+        work_journal.task_finished(task["task_id"], "failed", error=f"Spooled audio lost across restart: {str(e)}")
+        return
+    await process_audio_background(task["task_id"], audio_bytes, task["filename"], task["language"],
+                                   task["task_type"], task["profile"], task["spool_path"])
+
+def resume_background_tasks():
+    """Restart background uploads the journal shows as still processing when the server stopped"""
+    for task in work_journal.pending_tasks(WORK_JOURNAL_REPLAY_MAX_AGE_HOURS):
+        if task["attempts"] > WORK_JOURNAL_MAX_ATTEMPTS:
+            logger.error(f"Background task {task['task_id']}: Giving up after {task['attempts'] - 1} restarts")
+            work_journal.task_finished(task["task_id"], "failed", error="Interrupted by repeated server restarts")
+            _remove_spooled_upload(task["spool_path"])
+            continue
+        logger.info(f"Background task {task['task_id']}: Resuming {task['filename']} after restart")
+        handle = asyncio.get_running_loop().create_task(_resume_background_task(task))
+        resumed_background_tasks.add(handle)
+        handle.add_done_callback(resumed_background_tasks.discard)
+
+async def process_audio_background(task_id: str, audio_bytes: bytes, filename: str, language: str, task_type: str, profile: str = "accurate", spool_path: str = None):
     """Process audio in background and store results"""
     try:
         logger.info(f"Background task {task_id}: Starting transcription of {filename}")
@@ -3069,8 +5917,31 @@ async def process_audio_background(task_id: str, audio_bytes: bytes, filename: s
                 "filename": filename
             }
         
-        # Process audio
-        result = transcribe_audio_bytes(audio_bytes, task_id)
+        # Decode off the event loop, then stream segments so progress tracks audio time decoded
+        audio = await asyncio.to_thread(decode_audio_bytes, audio_bytes)
+        total_seconds = len(audio) / 16000
+        
+        def on_segment(segment):
+            if segment is None or not total_seconds:
+                return
+            progress = 10 + int(80 * min(segment["end"] / total_seconds, 1.0))
+            with task_lock:
+                if task_id in background_tasks:
+                    background_tasks[task_id]["progress"] = max(background_tasks[task_id].get("progress", 0), progress)
+        
+        def on_window_done(windows_done, windows_total, seconds_done):
+            with task_lock:
+                if task_id in background_tasks:
+                    background_tasks[task_id]["progress"] = 10 + int(80 * min(seconds_done / total_seconds, 1.0))
+                    background_tasks[task_id]["windows"] = {"done": windows_done, "total": windows_total}
+        
+        with task_lock:
+            background_tasks[task_id]["progress"] = 10
+        if total_seconds > LONG_AUDIO_SPLIT_SECONDS:
+            # Long recordings are split at pauses and decoded across all inference workers
+            result = await transcribe_long_audio(audio, profile, on_window_done)
+        else:
+            result = await audio_processor.transcribe_decoded(audio, profile, priority="bulk", label=filename, on_segment=on_segment)
         
         # Add metadata
         result.update({
@@ -3095,8 +5966,15 @@ async def process_audio_background(task_id: str, audio_bytes: bytes, filename: s
                 "filename": filename
             }
         
+        work_journal.task_finished(task_id, "completed", result=result)
+        _remove_spooled_upload(spool_path)
+        
         logger.info(f"Background task {task_id}: Transcription completed for {filename}")
         
+    except ProcessorShutdown:
+        # Interrupted, not failed: the journal row stays "processing" and the spooled audio stays,
+        # so resume_background_tasks picks it up on the next start
+        logger.warning(f"Background task {task_id}: Interrupted by shutdown, {filename} will resume on the next start")
     except Exception as e:
         logger.error(f"Background task {task_id}: Error processing {filename}: {str(e)}")
         with task_lock:
@@ -3106,6 +5984,8 @@ async def process_audio_background(task_id: str, audio_bytes: bytes, filename: s
                 "failed_at": datetime.now().isoformat(),
                 "filename": filename
             }
+        work_journal.task_finished(task_id, "failed", error=str(e))
+        _remove_spooled_upload(spool_path)
 
 async def cleanup_session(session_id):
     """Clean up session resources"""